@@ -0,0 +1,121 @@
+# One analyzed view of a document's text, shared by the parsers and the vectorizer.
+# The text is lowercased, cleaned and tokenized at most once; every view is
+# computed on first use and cached on the object.
+import re
+from functools import cached_property
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from Parser import patterns
+from Parser.sections import segment_sections
+
+# Same token rule as sklearn's default word analyzer
+TOKEN = re.compile(r'(?u)\b\w\w+\b')
+NON_WORD = re.compile(r'[^\w\s]')
+
+STOP_WORDS = {'english': ENGLISH_STOP_WORDS, None: frozenset()}
+
+
+class AnalyzedDocument:
+    """
+    Raw text plus lazily cached views of it
+    Pickles as plain text; the views are rebuilt on demand.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+        self._ngrams = {}
+        self._sections = {}
+
+    @classmethod
+    def from_cleaned(cls, cleaned):
+        """Wrap text that has already been through the cleaning step"""
+        doc = cls(cleaned)
+        doc.__dict__['cleaned'] = cleaned
+        return doc
+
+    def __getstate__(self):
+        return {'text': self.text}
+
+    def __setstate__(self, state):
+        self.__init__(state['text'])
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def cleaned(self):
+        """Lowercase text without URLs, emails, phone numbers and punctuation"""
+        text = patterns.URL.sub('', self.lower)
+        text = patterns.EMAIL_LIKE.sub('', text)
+        text = patterns.PHONE_LIKE.sub('', text)
+        text = NON_WORD.sub(' ', text)
+        return ' '.join(text.split())
+
+    @cached_property
+    def tokens(self):
+        """Word tokens of the cleaned text"""
+        return TOKEN.findall(self.cleaned)
+
+    def ngrams(self, ngram_range=(1, 2), stop_words='english'):
+        """Word n-grams after stop word removal, identical to sklearn's word analyzer"""
+        key = (ngram_range, stop_words)
+        if key not in self._ngrams:
+            excluded = STOP_WORDS[stop_words]
+            tokens = [token for token in self.tokens if token not in excluded]
+            min_n, max_n = ngram_range
+
+            grams = list(tokens) if min_n == 1 else []
+            for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+                grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            self._ngrams[key] = grams
+        return self._ngrams[key]
+
+    @cached_property
+    def section_offsets(self):
+        """{section: [(start, end), ...]} from Parser.sections.segment_sections"""
+        return segment_sections(self.text)
+
+    def section(self, *names):
+        """
+        Sub-document with the text of the named sections, in document order
+        Falls back to the whole document when none of them is present.
+        """
+        if names not in self._sections:
+            spans = sorted(span for name in names for span in self.section_offsets.get(name, ()))
+            if spans:
+                self._sections[names] = AnalyzedDocument("\n".join(self.text[start:end] for start, end in spans))
+            else:
+                self._sections[names] = self
+        return self._sections[names]
+
+    def contains(self, phrase):
+        """Case-insensitive substring test against the text"""
+        return phrase.lower() in self.lower
+
+
+def as_document(text):
+    """Reuse an AnalyzedDocument or wrap raw text in a new one"""
+    if isinstance(text, AnalyzedDocument):
+        return text
+    return AnalyzedDocument(text)
+
+
+class DocumentAnalyzer:
+    """
+    sklearn `analyzer` callable reading cached n-grams off AnalyzedDocuments
+    Plain strings are treated as already cleaned text, as before.
+    """
+
+    def __init__(self, ngram_range=(1, 2), stop_words='english'):
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+
+    def __call__(self, doc):
+        if not isinstance(doc, AnalyzedDocument):
+            doc = AnalyzedDocument.from_cleaned(doc)
+        return doc.ngrams(self.ngram_range, self.stop_words)
@@ -0,0 +1,58 @@
+# Fast DOCX text extraction:
+# 1. Open the .docx as a zip
+# 2. Stream the header parts and word/document.xml with iterparse
+# 3. Emit paragraph text (including table cells) line by line
+# No python-docx object model is built, so memory stays flat on big files.
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+TEXT_TAG = W_NS + 't'
+TAB_TAG = W_NS + 'tab'
+BREAK_TAGS = {W_NS + 'br', W_NS + 'cr'}
+PARAGRAPH_TAG = W_NS + 'p'
+CELL_TAG = W_NS + 'tc'
+
+HEADER_PART = re.compile(r'^word/header\d*\.xml$')
+BODY_PART = 'word/document.xml'
+
+
+def iter_part_lines(xml_file):
+    """Yield one line of text per paragraph of a WordprocessingML part"""
+    pieces = []
+
+    for event, elem in ET.iterparse(xml_file, events=('end',)):
+        tag = elem.tag
+        if tag == TEXT_TAG:
+            if elem.text:
+                pieces.append(elem.text)
+        elif tag == TAB_TAG:
+            pieces.append('\t')
+        elif tag in BREAK_TAGS:
+            pieces.append('\n')
+        elif tag == PARAGRAPH_TAG:
+            yield ''.join(pieces)
+            pieces = []
+            elem.clear()
+        elif tag == CELL_TAG:
+            # Cell paragraphs were already emitted; drop the subtree
+            elem.clear()
+
+
+def extract_docx_text(docx_path):
+    """
+    Extract text from headers, body paragraphs and tables of a .docx file
+    Raises zipfile.BadZipFile / KeyError / ET.ParseError on broken files.
+    """
+    lines = []
+
+    with zipfile.ZipFile(docx_path) as archive:
+        headers = sorted(name for name in archive.namelist() if HEADER_PART.match(name))
+
+        for part in headers + [BODY_PART]:
+            with archive.open(part) as xml_file:
+                lines.extend(line for line in iter_part_lines(xml_file) if line.strip())
+
+    return "\n".join(lines)
@@ -0,0 +1,18 @@
+# Content fingerprints used as cache keys (OCR results, parse caches, profiles)
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+
+def bytes_hash(data):
+    """SHA-256 hex digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path):
+    """SHA-256 hex digest of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,4 +1,5 @@
-import re
+from Parser import patterns
+from Parser.document import as_document
 
 class JobDescriptionParser:
     def __init__(self):
@@ -13,37 +14,32 @@ class JobDescriptionParser:
         with open(jd_path, 'r', encoding='utf-8') as file:
             text = file.read()
         
+        return self.parse_text(text)
+    
+    def parse_text(self, text):
+        """Parse job description from already loaded text"""
+        doc = as_document(text)
         return {
-            'raw_text': text,
-            'required_skills': self.extract_required_skills(text),
-            'required_experience': self.extract_required_experience(text),
+            'raw_text': doc.text,
+            'document': doc,
+            'required_skills': self.extract_required_skills(doc),
+            'required_experience': self.extract_required_experience(doc),
         }
     
     def extract_required_skills(self, text):
         """Extract required skills from JD"""
-        text_lower = text.lower()
+        doc = as_document(text)
         found_skills = []
         
         for skill in self.skills_database:
-            if skill.lower() in text_lower:
+            if doc.contains(skill):
                 found_skills.append(skill)
         
         return found_skills
     
     def extract_required_experience(self, text):
         """Extract required years of experience"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-            r'minimum\s+(\d+)\s+years?',
-            r'at least\s+(\d+)\s+years?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                return int(matches[0])
-        
-        return 0
+        return patterns.first_number(patterns.JD_EXPERIENCE, as_document(text).text)
 
 # Test
 if __name__ == "__main__":
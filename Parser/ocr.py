@@ -0,0 +1,128 @@
+# OCR fallback for scanned (image-only) PDF pages:
+# 1. ResumeParser flags pages that have no text layer
+# 2. The pages are queued on a separate, size-limited worker pool with its own
+#    per-page timeout; callers finish their text-layer documents meanwhile
+# 3. Tesseract output is cached by file hash so a document is OCRed once
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from Parser.fingerprint import bytes_hash, file_hash
+
+try:
+    import pytesseract
+    from pdf2image import convert_from_bytes, convert_from_path
+except ImportError:
+    pytesseract = None
+    convert_from_bytes = convert_from_path = None
+
+OCR_PAGE_TIMEOUT = 120   # seconds for rendering or recognising one page
+
+
+def ocr_available():
+    """True when pytesseract and pdf2image are installed"""
+    return pytesseract is not None
+
+
+class OCRQueue:
+    """
+    Local Tesseract OCR worker pool with a result cache keyed by file hash
+    """
+
+    def __init__(self, max_workers=2, cache_dir=None, dpi=300, lang='eng', timeout=OCR_PAGE_TIMEOUT):
+        """
+        Args:
+            max_workers: Concurrent OCR jobs; kept apart from the text-layer path
+            cache_dir: Optional directory for persisted results (<hash>.json)
+            dpi: Render resolution for page images
+            lang: Tesseract language code
+            timeout: Seconds allowed for rendering, and for recognising, each page
+        """
+        if pytesseract is None:
+            raise ImportError("OCR needs pytesseract and pdf2image: pip install pytesseract pdf2image")
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr')
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.lang = lang
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._cache = {}      # (file hash, pages) -> {page index: text}
+        self._pending = {}    # (file hash, pages) -> Future
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, key):
+        digest, pages = key
+        return os.path.join(self.cache_dir, f"{digest}-{'_'.join(map(str, pages))}.json")
+
+    def _load_cached(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        if self.cache_dir and os.path.exists(self._cache_path(key)):
+            with open(self._cache_path(key), 'r', encoding='utf-8') as f:
+                result = {int(page): text for page, text in json.load(f).items()}
+            self._cache[key] = result
+            return result
+        return None
+
+    def _run(self, key, source, pages):
+        # source is a file path or the PDF's bytes
+        convert = convert_from_bytes if isinstance(source, bytes) else convert_from_path
+        try:
+            result = {}
+            for page in pages:
+                images = convert(source, dpi=self.dpi, first_page=page + 1, last_page=page + 1,
+                                 timeout=self.timeout)
+                result[page] = "\n".join(
+                    pytesseract.image_to_string(image, lang=self.lang, timeout=self.timeout) for image in images
+                )
+        except BaseException:
+            # Failed jobs are not cached, so a later submit retries them
+            with self._lock:
+                self._pending.pop(key, None)
+            raise
+
+        # Publish the result and retire the pending job in one step, so no
+        # submit() in between can miss both and start the same OCR again
+        with self._lock:
+            self._cache[key] = result
+            self._pending.pop(key, None)
+        if self.cache_dir:
+            with open(self._cache_path(key), 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+
+        return result
+
+    def submit(self, pdf_path, pages):
+        """
+        Queue OCR of the given 0-based page indices
+        Returns:
+            Future resolving to {page index: text}
+        """
+        return self._submit((file_hash(pdf_path), tuple(sorted(pages))), pdf_path)
+
+    def submit_bytes(self, pdf_bytes, pages):
+        """Like submit, for a PDF held in memory (e.g. an upload)"""
+        return self._submit((bytes_hash(pdf_bytes), tuple(sorted(pages))), pdf_bytes)
+
+    def _submit(self, key, source):
+        with self._lock:
+            cached = self._load_cached(key)
+            if cached is not None:
+                # Cache hits never wait behind running OCR jobs
+                future = Future()
+                future.set_result(dict(cached))
+            elif key in self._pending:
+                future = self._pending[key]
+            else:
+                future = self.executor.submit(self._run, key, source, key[1])
+                self._pending[key] = future
+
+        return future
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,46 @@
+# Shared regexes for contact / experience extraction and text cleanup.
+# Every repetition that can run over user text is bounded, so a search costs
+# at most a constant amount of work per start position and stays linear in
+# the text length even on number tables or very long tokens.
+import re
+
+# Contact details
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b')
+PHONE = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+# Years of experience in a resume: "5 years of experience", "experience: 3+ years", "2-4 years"
+RESUME_EXPERIENCE = (
+    re.compile(r'(?<!\d)(\d{1,2})\+?\s{0,3}years?\s{1,3}(?:of\s{1,3})?experience', re.IGNORECASE),
+    re.compile(r'experience\s{0,3}:?\s{0,3}(\d{1,2})(?!\d)\+?\s{0,3}years?', re.IGNORECASE),
+    re.compile(r'(?<!\d)(\d{1,2})\s{0,3}-\s{0,3}(\d{1,2})\s{0,3}years?', re.IGNORECASE),
+)
+
+# Required experience in a job description
+JD_EXPERIENCE = (
+    re.compile(r'(?<!\d)(\d{1,2})\+?\s{0,3}years?\s{1,3}(?:of\s{1,3})?experience', re.IGNORECASE),
+    re.compile(r'minimum\s{1,3}(\d{1,2})\s{1,3}years?', re.IGNORECASE),
+    re.compile(r'at least\s{1,3}(\d{1,2})\s{1,3}years?', re.IGNORECASE),
+)
+
+# Noise removed before vectorization
+URL = re.compile(r'http\S+|www\S+')
+EMAIL_LIKE = re.compile(r'[^\s@]{1,64}@\S{1,253}')
+# Left unbounded on purpose: it must strip exactly what the original cleanup
+# stripped (year ranges like 2019-2023 included) to keep tokens unchanged, and
+# it is already linear - an attempt can only fail on a run holding one digit
+PHONE_LIKE = re.compile(r'\+?\d[\d\s\-\(\)]+\d')
+
+
+def first_match(pattern, text):
+    """Text of the first match of pattern, or None"""
+    match = pattern.search(text)
+    return match.group(0) if match else None
+
+
+def first_number(patterns, text, default=0):
+    """First captured number from the first pattern that matches, tried in order"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1))
+    return default
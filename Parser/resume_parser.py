@@ -4,9 +4,11 @@
 #4. convert into plain text
 #5. return the text
 import PyPDF2  #to read the pdf resume 
-import re      #to find the patterns
 import spacy   #for nlp 
 from docx import Document 
+from Parser.docx_reader import extract_docx_text
+from Parser import patterns
+from Parser.document import as_document
 
 # Smart model loading with fallback
 try:
@@ -16,6 +18,14 @@ except OSError:
     nlp = spacy.blank("en")
 
 class ResumeParser:
+    # Sections each extractor reads (Parser/sections.py); whole text if none are present
+    section_scopes = {
+        'contact': ('preamble', 'contact'),
+        'skills': ('skills', 'experience', 'projects', 'summary', 'other'),
+        'experience': ('preamble', 'summary', 'experience'),
+        'education': ('education',),
+    }
+
     def __init__(self):
         self.skills_database ={
             'python', 'java', 'javascript', 'react', 'sql', 'mongodb',
@@ -24,68 +34,83 @@ class ResumeParser:
             'data analysis', 'pandas', 'numpy', 'scikit-learn'
         }
 
-    def extract_text_from_pdf(self,pdf_path):
-        #extract text from pdf
-        text = ""
+    def extract_pdf_pages(self,pdf_path):
+        #extract text of every pdf page; image-only pages come back as ""
+        pages = []
         try:
             with open(pdf_path,'rb') as file:
                 pdf_reader  = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
-                    text += page.extract_text()
+                    pages.append(page.extract_text() or "")
+        except MemoryError:
+            raise  # a worker over its memory cap must fail, not return empty text
         except Exception as e:
             print(f" Error reading PDF : {e}")
-        return text
+        return pages
+    
+    def extract_text_from_pdf(self,pdf_path):
+        #extract text from pdf
+        return "".join(self.extract_pdf_pages(pdf_path))
     
     def extract_text_from_docx(self,docx_path):
-        # Extract text from docx
+        # Extract text from docx - streaming reader first, python-docx as fallback
+        try:
+            return extract_docx_text(docx_path)
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(f" Fast DOCX reader failed, falling back to python-docx: {e}")
+        
         try:
             doc = Document(docx_path)
-            text ="/n".join([para.text for para in doc.paragrpahs])
-            return text
+            lines = [para.text for section in doc.sections for para in section.header.paragraphs]
+            lines.extend(para.text for para in doc.paragraphs)
+            for table in doc.tables:
+                for row in table.rows:
+                    lines.extend(cell.text for cell in row.cells)
+            return "\n".join(line for line in lines if line.strip())
+        except MemoryError:
+            raise
         except Exception as e:
             print(f" Error reading docx: {e}")
             return ""
+    
+    def section(self, text, field):
+        """The part of the document the extractor for field should scan"""
+        return as_document(text).section(*self.section_scopes[field])
+    
+    def search(self, text, field, find, not_found=None):
+        """
+        Run find on the field's sections, then on the whole document if that
+        found nothing (the value may sit under a heading the scope leaves out)
+        """
+        doc = as_document(text)
+        scoped = self.section(doc, field)
+        result = find(scoped)
+        if result == not_found and scoped is not doc:
+            result = find(doc)
+        return result
+    
     def extract_contact_info(self, text):
         """Extract email and phone number"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        email = re.findall(email_pattern, text)
-        phone = re.findall(phone_pattern, text)
-        
+        # First match only - no need to scan the whole text with findall
         return {
-            'email': email[0] if email else None,
-            'phone': phone[0] if phone else None
+            'email': self.search(text, 'contact', lambda doc: patterns.first_match(patterns.EMAIL, doc.text)),
+            'phone': self.search(text, 'contact', lambda doc: patterns.first_match(patterns.PHONE, doc.text))
         }
     
     def extract_skills(self, text):
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
+        def find(doc):
+            return [skill for skill in self.skills_database if doc.contains(skill)]
         
-        for skill in self.skills_database:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return list(set(found_skills))  # Remove duplicates
+        return list(set(self.search(text, 'skills', find, [])))  # Remove duplicates
     
     def extract_experience_years(self, text):
         """Extract years of experience"""
-        # Look for patterns like "5 years", "3+ years", "2-4 years"
-        patterns = [
-            r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-            r'experience\s*:?\s*(\d+)\+?\s*years?',
-            r'(\d+)\s*-\s*(\d+)\s*years?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    return int(matches[0][0])  # Return first number
-                return int(matches[0])
-        
-        return 0
+        # Look for patterns like "5 years", "3+ years", "2-4 years" (first number of a range)
+        return self.search(text, 'experience',
+                           lambda doc: patterns.first_number(patterns.RESUME_EXPERIENCE, doc.text), 0)
     
     def extract_education(self, text):
         """Extract education level"""
@@ -95,7 +120,9 @@ class ResumeParser:
             'Bachelors': ['bachelors', 'bachelor', 'bs', 'b.s', 'b.tech', 'be', 'b.e']
         }
         
-        text_lower = text.lower()
+        # No whole-document fallback: short keywords like 'ms' would match
+        # words such as 'teams' in resumes whose Education section has no degree
+        text_lower = self.section(text, 'education').lower
         
         for degree, keywords in education_keywords.items():
             for keyword in keywords:
@@ -105,28 +132,61 @@ class ResumeParser:
         return "Not specified"
     
     def parse_resume(self, file_path):
-        """Main parsing function"""
+        """
+        Main parsing function
+        PDFs with image-only pages get 'ocr_pages' (0-based page indices)
+        and 'page_texts'; pass OCR output to apply_ocr to complete them.
+        """
         # Determine file type and extract text
+        blank_pages = []
         if file_path.endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_path)
+            pages = self.extract_pdf_pages(file_path)
+            text = "".join(pages)
+            blank_pages = [i for i, page_text in enumerate(pages) if not page_text.strip()]
         elif file_path.endswith('.docx'):
             text = self.extract_text_from_docx(file_path)
         else:
             return None
         
+        resume_data = self.parse_text(text)
+        if blank_pages:
+            resume_data['ocr_pages'] = blank_pages
+            resume_data['page_texts'] = pages
+        
+        return resume_data
+    
+    def apply_ocr(self, resume_data, ocr_texts):
+        """Re-parse a resume after filling its image-only pages with OCR text"""
+        pages = list(resume_data['page_texts'])
+        for page, page_text in ocr_texts.items():
+            pages[page] = page_text
+        
+        return self.parse_text("".join(pages))
+    
+    def parse_text(self, text):
+        """
+        Extract all fields from already extracted resume text
+        'document' is the shared AnalyzedDocument, reused by the vectorizer;
+        'sections' holds its section offsets ({name: [[start, end], ...]}).
+        """
+        # Lowercase / tokenize once for every extractor
+        doc = as_document(text)
+        
         # Extract all information
-        contact_info = self.extract_contact_info(text)
-        skills = self.extract_skills(text)
-        experience = self.extract_experience_years(text)
-        education = self.extract_education(text)
+        contact_info = self.extract_contact_info(doc)
+        skills = self.extract_skills(doc)
+        experience = self.extract_experience_years(doc)
+        education = self.extract_education(doc)
         
         return {
-            'raw_text': text,
+            'raw_text': doc.text,
+            'document': doc,
             'email': contact_info['email'],
             'phone': contact_info['phone'],
             'skills': skills,
             'experience_years': experience,
-            'education': education
+            'education': education,
+            'sections': {name: [list(span) for span in spans] for name, spans in doc.section_offsets.items()}
         }
 
 # Test the parser
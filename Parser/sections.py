@@ -0,0 +1,56 @@
+# One-pass resume section segmentation.
+# A header is a line that is only a known heading ("WORK EXPERIENCE") or a
+# heading followed by a colon ("Skills: Python, SQL"). Each section runs from
+# the end of its header to the start of the next one; text before the first
+# header is the 'preamble' (usually name and contact details).
+import re
+
+SECTION_HEADERS = {
+    'contact': ['contact', 'contact information', 'contact details', 'contact info',
+                'personal information', 'personal details'],
+    'summary': ['summary', 'professional summary', 'career summary', 'profile',
+                'professional profile', 'objective', 'career objective', 'about me'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset',
+               'core competencies', 'competencies', 'technologies', 'technical expertise', 'tools'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'relevant experience'],
+    'education': ['education', 'educational background', 'academic background', 'academics',
+                  'academic qualifications', 'qualifications', 'education and training'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'selected projects'],
+    'other': ['certifications', 'certificates', 'awards', 'achievements', 'publications', 'interests',
+              'hobbies', 'languages', 'references', 'volunteering', 'volunteer experience', 'activities'],
+}
+
+_HEADER_TO_SECTION = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+
+# Longest headers first so "work experience" wins over "experience"
+_HEADER_PATTERN = re.compile(
+    r'^[ \t]*(' + '|'.join(
+        re.escape(header).replace(r'\ ', r'[ \t]{1,3}')
+        for header in sorted(_HEADER_TO_SECTION, key=len, reverse=True)
+    ) + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def segment_sections(text):
+    """
+    Split text into sections in one regex pass
+    Returns:
+        {section: [(start, end), ...]} character offsets into text, in document order
+        (empty when the text has no recognizable headers)
+    """
+    sections = {}
+    headers = [
+        (match.start(), match.end(), _HEADER_TO_SECTION[' '.join(match.group(1).lower().split())])
+        for match in _HEADER_PATTERN.finditer(text)
+    ]
+
+    if headers and text[:headers[0][0]].strip():
+        sections['preamble'] = [(0, headers[0][0])]
+
+    for i, (_, body_start, section) in enumerate(headers):
+        body_end = headers[i + 1][0] if i + 1 < len(headers) else len(text)
+        sections.setdefault(section, []).append((body_start, body_end))
+
+    return sections
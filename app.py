@@ -1,9 +1,13 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from matcher import CandidateMatcher
-import tempfile
+from Parser.fingerprint import bytes_hash
+from Parser.ocr import ocr_available
+from scoring import BANDS, DEFAULT_THRESHOLDS, DEFAULT_WEIGHTS, RECOMMENDATIONS, ScoreTable
+from pool_analytics import PoolAnalytics
+from text_vectorizer import TextVectorizer
 import os
-import shutil
 
 # Page config
 st.set_page_config(
@@ -42,9 +46,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize matcher
-if 'matcher' not in st.session_state:
-    st.session_state.matcher = CandidateMatcher()
+# One matcher and parse cache shared by every session in this process
+@st.cache_resource
+def get_matcher():
+    # Scanned PDFs are OCRed when pytesseract / pdf2image are installed
+    return CandidateMatcher(ocr_workers=2 if ocr_available() else 0)
+
+
+@st.cache_data(max_entries=5000, show_spinner=False)
+def parse_resume_bytes(file_hash, extension, _file_bytes):
+    """
+    Parse an uploaded resume; cached by content hash, so re-runs skip parsing
+    Sessions uploading the same file at the same time share one parse (and its error).
+    """
+    return get_matcher().parse_resume_bytes(_file_bytes, extension, content_hash=file_hash)
+
+
+@st.cache_data(max_entries=200, show_spinner=False)
+def parse_job_description_text(job_description):
+    return get_matcher().parse_job_description_text(job_description)
+
+
+def candidate_frame(results):
+    """Columns that do not depend on weights; built once per analysis"""
+    return pd.DataFrame({
+        'Candidate': [r['candidate_name'] for r in results],
+        'Email': [r.get('email') or 'N/A' for r in results],
+        'Education': [r.get('education', 'N/A') for r in results],
+        'Experience (yrs)': [r.get('experience_years', 0) for r in results],
+        'Skills Match': [r['skill_match_percentage'] for r in results],
+        'Text Similarity': [r['text_similarity'] for r in results],
+        'Experience Match': [r.get('experience_match', 0) for r in results],
+    })
+
+
+BAND_LABELS = np.array(["🔴 Weak", "🟠 Possible", "🟡 Good", "🟢 Strong"])
+BAND_RECOMMENDATIONS = np.array([RECOMMENDATIONS[band] for band in BANDS])
+BAND_CSS = ("score-low", "score-low", "score-medium", "score-high")
+
+
+matcher = get_matcher()
 
 # Header
 st.markdown('<h1 class="main-header">🤖 AI Resume Screening System</h1>', unsafe_allow_html=True)
@@ -68,9 +109,36 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("### 📊 Scoring Weights")
-    st.write("- Skills Match: 50%")
-    st.write("- Text Similarity: 30%")
-    st.write("- Experience: 20%")
+    skills_weight = st.slider("Skills Match", 0, 100, int(DEFAULT_WEIGHTS['skills'] * 100), step=5)
+    similarity_weight = st.slider("Text Similarity", 0, 100, int(DEFAULT_WEIGHTS['similarity'] * 100), step=5)
+    experience_weight = st.slider("Experience", 0, 100, int(DEFAULT_WEIGHTS['experience'] * 100), step=5)
+    
+    if skills_weight + similarity_weight + experience_weight == 0:
+        st.warning("All weights are 0 - using the defaults")
+        weights = dict(DEFAULT_WEIGHTS)
+    else:
+        weights = {
+            'skills': skills_weight,
+            'similarity': similarity_weight,
+            'experience': experience_weight
+        }
+        total_weight = sum(weights.values())
+        st.caption(" | ".join(f"{name.title()}: {value / total_weight:.0%}" for name, value in weights.items()))
+    
+    st.markdown("### 🎯 Recommendation Thresholds")
+    strong_threshold = st.slider("🟢 Strong Match from", 0, 100, DEFAULT_THRESHOLDS['strong'])
+    good_threshold = st.slider("🟡 Good Match from", 0, 100, DEFAULT_THRESHOLDS['good'])
+    possible_threshold = st.slider("🟠 Possible Match from", 0, 100, DEFAULT_THRESHOLDS['possible'])
+    
+    # Keep the bands ordered whatever order the sliders are moved in
+    possible_threshold, good_threshold, strong_threshold = sorted(
+        (possible_threshold, good_threshold, strong_threshold)
+    )
+    thresholds = {
+        'possible': possible_threshold,
+        'good': good_threshold,
+        'strong': strong_threshold
+    }
 
 # Main content
 tab1, tab2, tab3 = st.tabs(["📤 Upload & Analyze", "📊 Results", "ℹ️ How It Works"])
@@ -133,145 +201,212 @@ with tab1:
         else:
             with st.spinner("🔄 Processing resumes... This may take a moment..."):
                 results = []
+                jd_data = parse_job_description_text(job_description)
                 
-                # Create temp directory for processing
-                temp_dir = tempfile.mkdtemp()
+                def add_result(name, resume_data):
+                    result = matcher.score_candidate(resume_data, jd_data, name)
+                    result['document'] = resume_data.get('document', resume_data['raw_text'])
+                    results.append(result)
                 
-                try:
-                    # Save JD to temp file
-                    jd_path = os.path.join(temp_dir, "job_description.txt")
-                    with open(jd_path, 'w', encoding='utf-8') as f:
-                        f.write(job_description)
-                    
-                    # Process each resume
-                    progress_bar = st.progress(0)
-                    for idx, uploaded_file in enumerate(uploaded_files):
-                        # Save resume to temp file
-                        resume_path = os.path.join(temp_dir, uploaded_file.name)
-                        with open(resume_path, 'wb') as f:
-                            f.write(uploaded_file.getbuffer())
-                        
-                        # Match candidate
-                        try:
-                            result = st.session_state.matcher.match_candidate(resume_path, jd_path)
-                            results.append(result)
-                        except Exception as e:
-                            st.warning(f"⚠️ Error processing {uploaded_file.name}: {str(e)}")
-                        
-                        progress_bar.progress((idx + 1) / len(uploaded_files))
-                    
-                    # Sort by score
-                    results.sort(key=lambda x: x['overall_score'], reverse=True)
+                # Process each resume; scanned pages go to the shared OCR pool meanwhile
+                progress_bar = st.progress(0)
+                ocr_jobs = []
+                for idx, uploaded_file in enumerate(uploaded_files):
+                    file_bytes = uploaded_file.getvalue()
+                    extension = os.path.splitext(uploaded_file.name)[1].lower()
                     
-                    # Store in session state
-                    st.session_state.results = results
-                    st.session_state.processed = True
+                    # Match candidate
+                    try:
+                        resume_data = parse_resume_bytes(bytes_hash(file_bytes), extension, file_bytes)
+                        if resume_data is None:
+                            raise ValueError("unsupported file type")
+                        future = matcher.submit_ocr(resume_data, file_bytes=file_bytes)
+                        if future is not None:
+                            ocr_jobs.append((uploaded_file.name, resume_data, future))
+                            continue
+                        if resume_data.get('ocr_pages'):
+                            st.warning(f"⚠️ {uploaded_file.name}: {len(resume_data['ocr_pages'])} scanned page(s) "
+                                       "could not be read - install pytesseract and pdf2image to OCR them")
+                        add_result(uploaded_file.name, resume_data)
+                    except Exception as e:
+                        st.warning(f"⚠️ Error processing {uploaded_file.name}: {str(e)}")
                     
-                    st.success(f"✅ Successfully analyzed {len(results)} candidate(s)!")
-                    st.balloons()
-                    
-                finally:
-                    # Cleanup temp files
-                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    progress_bar.progress((idx + 1) / len(uploaded_files))
+                
+                # OCR results are merged once every text-layer resume is scored
+                for name, resume_data, future in ocr_jobs:
+                    try:
+                        add_result(name, matcher.finish_ocr(resume_data, future))
+                    except Exception as e:
+                        st.warning(f"⚠️ Error processing {name} (OCR): {str(e)}")
+                
+                # Explanation keywords for every candidate from one fit on the pool
+                texts = [result.pop('document') for result in results]
+                try:
+                    keywords = TextVectorizer(method='tfidf').explain_pool(texts, top_n=8) if texts else []
+                except ValueError:
+                    keywords = [[] for _ in texts]  # no usable text in the pool
+                for result, top_keywords in zip(results, keywords):
+                    result['top_keywords'] = [keyword for keyword, _ in top_keywords]
+                
+                # Sort by score
+                results.sort(key=lambda x: x['overall_score'], reverse=True)
+                
+                # Store in session state
+                st.session_state.results = results
+                st.session_state.score_table = ScoreTable.from_results(results)
+                st.session_state.candidate_table = candidate_frame(results)
+                st.session_state.analytics = PoolAnalytics.from_results(results)
+                st.session_state.processed = True
+                
+                st.success(f"✅ Successfully analyzed {len(results)} candidate(s)!")
+                st.balloons()
 
 with tab2:
     if 'processed' in st.session_state and st.session_state.processed:
         results = st.session_state.results
+        if 'candidate_table' not in st.session_state:
+            st.session_state.candidate_table = candidate_frame(results)
+        
+        # Re-score with the sidebar weights - one vectorized pass over the score columns,
+        # no per-candidate dicts or widgets
+        order, overall = st.session_state.score_table.ranking(weights)
+        bands = st.session_state.score_table.bands(overall, thresholds)
         
         # Summary stats
         st.markdown("## 📈 Summary Statistics")
         col1, col2, col3, col4 = st.columns(4)
         
-        total = len(results)
-        strong = len([r for r in results if r['overall_score'] >= 75])
-        good = len([r for r in results if 60 <= r['overall_score'] < 75])
-        weak = len([r for r in results if r['overall_score'] < 60])
+        analytics = st.session_state.analytics
+        band_counts = analytics.band_counts(weights, thresholds)
         
-        col1.metric("Total Candidates", total)
-        col2.metric("🟢 Strong Match", strong)
-        col3.metric("🟡 Good Match", good)
-        col4.metric("🔴 Weak Match", weak)
+        col1.metric("Total Candidates", len(analytics))
+        col2.metric("🟢 Strong Match", band_counts['strong'])
+        col3.metric("🟡 Good Match", band_counts['good'])
+        col4.metric("🔴 Weak Match", band_counts['possible'] + band_counts['weak'])
+        
+        with st.expander("📊 Pool Analytics"):
+            percentiles = analytics.percentiles(weights=weights)
+            st.markdown("**Overall score percentiles:** " + " | ".join(
+                f"P{p}: {value}%" for p, value in percentiles.items()
+            ))
+            
+            counts, edges = analytics.score_histogram(weights=weights)
+            st.bar_chart(pd.DataFrame(
+                {'Candidates': counts},
+                index=[f"{int(lo)}-{int(hi)}" for lo, hi in zip(edges[:-1], edges[1:])]
+            ))
+            
+            st.markdown("**Required skill coverage:**")
+            st.dataframe(pd.DataFrame(
+                analytics.skill_coverage(),
+                columns=['Skill', 'Candidates With Skill', 'Required For', 'Coverage %']
+            ), hide_index=True, use_container_width=True)
         
         st.markdown("---")
         
-        # Detailed results
+        # Ranking table - one virtualized dataframe instead of a widget tree per candidate
         st.markdown("## 🏆 Candidate Rankings")
         
-        for idx, result in enumerate(results, 1):
-            score = result['overall_score']
-            
-            # Determine CSS class based on score
-            if score >= 75:
-                css_class = "score-high"
-                emoji = "🟢"
-            elif score >= 60:
-                css_class = "score-medium"
-                emoji = "🟡"
-            else:
-                css_class = "score-low"
-                emoji = "🔴"
+        ranked = st.session_state.candidate_table.assign(
+            **{'Overall Score': overall, 'Match': BAND_LABELS[bands]}
+        ).iloc[order]
+        ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+        
+        search = st.text_input("🔎 Filter by name or email", placeholder="e.g. alice or @example.com")
+        view = ranked
+        if search:
+            view = ranked[
+                ranked['Candidate'].str.contains(search, case=False, regex=False)
+                | ranked['Email'].str.contains(search, case=False, regex=False)
+            ]
+        
+        st.caption(f"Showing {len(view)} of {len(ranked)} candidates - click a column to sort, "
+                   "select a row for the detailed analysis")
+        percent = st.column_config.ProgressColumn(format="%.1f%%", min_value=0, max_value=100)
+        event = st.dataframe(
+            view,
+            hide_index=True,
+            use_container_width=True,
+            column_order=['Rank', 'Candidate', 'Overall Score', 'Match', 'Skills Match', 'Text Similarity',
+                          'Experience Match', 'Experience (yrs)', 'Education', 'Email'],
+            column_config={
+                'Overall Score': percent,
+                'Skills Match': percent,
+                'Text Similarity': percent,
+                'Experience Match': percent,
+            },
+            on_select="rerun",
+            selection_mode="single-row",
+            key="ranking_table"
+        )
+        
+        # Detail panel only for the selected candidate
+        selected_rows = [row for row in event.selection.rows if row < len(view)]
+        if selected_rows:
+            i = view.index[selected_rows[0]]
+            result = results[i]
+            score = float(overall[i])
             
             with st.container():
-                st.markdown(f'<div class="{css_class}">', unsafe_allow_html=True)
+                st.markdown(f'<div class="{BAND_CSS[bands[i]]}">', unsafe_allow_html=True)
                 
                 col1, col2 = st.columns([3, 1])
                 
                 with col1:
-                    st.markdown(f"### {emoji} Rank #{idx}: {result['candidate_name']}")
+                    st.markdown(f"### {BAND_LABELS[bands[i]][0]} Rank #{int(ranked.loc[i, 'Rank'])}: {result['candidate_name']}")
                     st.write(f"**Email:** {result.get('email', 'N/A') or 'N/A'} | **Phone:** {result.get('phone', 'N/A') or 'N/A'}")
                     st.write(f"**Education:** {result.get('education', 'N/A')} | **Experience:** {result.get('experience_years', 0)} years")
                 
                 with col2:
                     st.metric("Overall Score", f"{score}%")
                 
-                # Expandable details
-                with st.expander("📊 View Detailed Analysis"):
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric("Skills Match", f"{result['skill_match_percentage']}%")
-                    col2.metric("Text Similarity", f"{result['text_similarity']}%")
-                    col3.metric("Experience Match", f"{result.get('experience_match', 0)}%")
-                    
-                    st.markdown("**✅ Matched Skills:**")
-                    if result.get('matched_skills'):
-                        st.write(", ".join(result['matched_skills']))
-                    else:
-                        st.write("None")
-                    
-                    st.markdown("**❌ Missing Skills:**")
-                    if result.get('missing_skills'):
-                        st.write(", ".join(result['missing_skills']))
-                    else:
-                        st.write("None")
-                    
-                    st.info(result.get('recommendation', 'No recommendation available'))
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Skills Match", f"{result['skill_match_percentage']}%")
+                col2.metric("Text Similarity", f"{result['text_similarity']}%")
+                col3.metric("Experience Match", f"{result.get('experience_match', 0)}%")
+                
+                st.markdown("**✅ Matched Skills:**")
+                if result.get('matched_skills'):
+                    st.write(", ".join(result['matched_skills']))
+                else:
+                    st.write("None")
+                
+                st.markdown("**❌ Missing Skills:**")
+                if result.get('missing_skills'):
+                    st.write(", ".join(result['missing_skills']))
+                else:
+                    st.write("None")
+                
+                st.markdown("**🔑 Distinctive Keywords:**")
+                st.write(", ".join(result.get('top_keywords', [])) or "None")
+                
+                st.info(BAND_RECOMMENDATIONS[bands[i]])
                 
                 st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown("---")
+        
+        st.markdown("---")
         
         # Download results
         st.markdown("## 📥 Export Results")
         
-        # Prepare DataFrame
-        df_data = []
-        for idx, r in enumerate(results, 1):
-            df_data.append({
-                'Rank': idx,
-                'Candidate': r['candidate_name'],
-                'Email': r.get('email', 'N/A'),
-                'Overall Score': f"{r['overall_score']}%",
-                'Skills Match': f"{r['skill_match_percentage']}%",
-                'Text Similarity': f"{r['text_similarity']}%",
-                'Experience': r.get('experience_years', 0),
-                'Recommendation': r.get('recommendation', 'N/A')
+        def ranking_csv():
+            # Built only when the download button is clicked
+            export = pd.DataFrame({
+                'Rank': ranked['Rank'],
+                'Candidate': ranked['Candidate'],
+                'Email': ranked['Email'],
+                'Overall Score': [f"{score}%" for score in ranked['Overall Score']],
+                'Skills Match': [f"{score}%" for score in ranked['Skills Match']],
+                'Text Similarity': [f"{score}%" for score in ranked['Text Similarity']],
+                'Experience': ranked['Experience (yrs)'],
+                'Recommendation': BAND_RECOMMENDATIONS[bands[order]]
             })
-        
-        df = pd.DataFrame(df_data)
-        
-        csv = df.to_csv(index=False).encode('utf-8')
+            return export.to_csv(index=False).encode('utf-8')
         
         st.download_button(
             label="📥 Download Results as CSV",
-            data=csv,
+            data=ranking_csv,
             file_name="candidate_rankings.csv",
             mime="text/csv",
             use_container_width=True
@@ -302,14 +437,14 @@ with tab3:
     - Computes cosine similarity between resume and JD
     - Measures how closely the candidate matches the job
     
-    #### 4️⃣ **Multi-Factor Scoring**
+    #### 4️⃣ **Multi-Factor Scoring** (default weights, adjustable in the sidebar)
     - **Skills Match (50% weight)**: Percentage of required skills found
     - **Text Similarity (30% weight)**: TF-IDF cosine similarity
     - **Experience Match (20% weight)**: Years of experience comparison
     
     #### 5️⃣ **Intelligent Ranking**
     - Sorts candidates by overall score
-    - Provides hiring recommendations:
+    - Provides hiring recommendations (default thresholds, adjustable in the sidebar):
       - 🟢 **75%+** = Strong Match (Schedule Interview)
       - 🟡 **60-74%** = Good Match (Review Carefully)
       - 🔴 **<60%** = Weak Match (Not Recommended)
@@ -0,0 +1,572 @@
+"""
+Resumable batch ranking for large resume pools.
+
+Resumes are parsed and scored against every JD inside SupervisedPool
+workers. With near-duplicate detection on, workers first return parsed
+resumes with their MinHash signatures; the parent drops duplicates and
+sends only one representative per group back for scoring. Each finished
+resume is appended to a JSONL checkpoint in the output directory, flushed
+every few documents; a re-run with the same output directory skips
+everything already in the checkpoint.
+
+With a feature store directory, workers only parse: their cleaned texts
+are checkpointed next to the records, their term counts are written as a
+memory-mapped feature store, and every JD is scored against it in one
+sparse pass instead of one vectorizer fit per resume and JD. The scores
+match the per-resume comparison.
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+from scheduling import largest_first, print_utilization
+from workers import SupervisedPool
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+CHECKPOINT_FILE = "checkpoint.jsonl"
+TEXTS_FILE = "texts.jsonl"
+
+# Parsed fields kept per resume when scoring happens after the pool run
+RESUME_FIELDS = ('email', 'phone', 'education', 'experience_years', 'skills')
+
+
+def read_manifest(manifest_path):
+    """One path, directory or glob per line; blank lines and # comments are skipped"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def expand_resume_sources(sources):
+    """Resolve files, directories and glob patterns into a sorted list of resume paths"""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = [os.path.join(source, name) for name in os.listdir(source)]
+        elif glob.has_magic(source):
+            matches = glob.glob(source, recursive=True)
+        else:
+            matches = [source]
+
+        paths.update(
+            os.path.normpath(path) for path in matches
+            if path.lower().endswith(RESUME_EXTENSIONS) and os.path.isfile(path)
+        )
+    return sorted(paths)
+
+
+def jd_names(jd_paths):
+    """Short, unique display name per JD file (its file name without extension)"""
+    names = {}
+    for jd_path in jd_paths:
+        name = os.path.splitext(os.path.basename(jd_path))[0]
+        unique, n = name, 2
+        while unique in names.values():
+            unique, n = f"{name}_{n}", n + 1
+        names[jd_path] = unique
+    return names
+
+
+class BatchScoringTask:
+    """
+    Pool task over three kinds of items:
+        resume path: parse it; with dedupe on, return the parsed data and its
+            MinHash signature so the parent can drop duplicates before any
+            scoring, otherwise score it against every JD right away. With
+            OCR on, a resume with image-only pages is returned unscored with
+            its 'ocr_pages' for the parent's OCR pool
+        (resume path, parsed data): score parsed data against every JD
+        (resume path, parsed data, OCR texts): merge the OCR text, then go on
+            as for a resume path
+    With parse_only, resume paths are never scored: the task returns the
+    RESUME_FIELDS and the cleaned text for the parent's feature store.
+    """
+
+    def __init__(self, jd_texts, dedupe_threshold=None, weights=None, thresholds=None, profile=False,
+                 ocr=False, parse_only=False):
+        """
+        Args:
+            jd_texts: {jd name: JD text}
+            dedupe_threshold: Return parsed data and a MinHash signature instead of scores when set
+            weights, thresholds: Passed to CandidateMatcher
+            profile: Also return the document's profiling trace
+            ocr: Hand resumes with image-only PDF pages back for OCR instead of skipping those pages
+            parse_only: Return parsed fields and cleaned text instead of scores
+        """
+        self.jd_texts = jd_texts
+        self.dedupe_threshold = dedupe_threshold
+        self.parse_only = parse_only
+        self.weights = weights
+        self.thresholds = thresholds
+        self.profile = profile
+        self.ocr = ocr
+        self._matcher = None
+        self._jd_data = None
+        self._deduplicator = None
+
+    def _setup(self):
+        from matcher import CandidateMatcher
+
+        profiler = None
+        if self.profile:
+            from profiling import DocumentProfiler
+            profiler = DocumentProfiler(keep_slowest=0)
+
+        self._matcher = CandidateMatcher(weights=self.weights, thresholds=self.thresholds, profiler=profiler)
+        self._jd_data = {
+            name: self._matcher.jd_parser.parse_text(text)
+            for name, text in self.jd_texts.items()
+        }
+        if self.dedupe_threshold:
+            from dedup import ResumeDeduplicator
+            self._deduplicator = ResumeDeduplicator(threshold=self.dedupe_threshold)
+
+    def _parse(self, resume_path):
+        """Parse one resume's text layer; without OCR, scanned pages are skipped"""
+        matcher = self._matcher
+        with matcher._stage('parse'):
+            resume_data = matcher.resume_parser.parse_resume(resume_path)
+
+        skipped_pages = 0
+        if resume_data.get('ocr_pages') and not self.ocr:
+            skipped_pages = len(resume_data.pop('ocr_pages'))
+            resume_data.pop('page_texts', None)
+        return resume_data, skipped_pages
+
+    def _score(self, resume_path, resume_data):
+        matcher = self._matcher
+        return {
+            name: matcher.score_candidate(resume_data, jd_data, resume_path)
+            for name, jd_data in self._jd_data.items()
+        }
+
+    def __call__(self, item):
+        if self._matcher is None:
+            self._setup()
+
+        matcher = self._matcher
+        resume_path = item[0] if isinstance(item, tuple) else item
+        with matcher._document(resume_path):
+            if isinstance(item, tuple) and len(item) == 2:
+                payload = {'results': self._score(*item)}
+            else:
+                if isinstance(item, tuple):
+                    # Text from the parent's OCR pool
+                    with matcher._stage('ocr'):
+                        resume_data, skipped_pages = matcher.resume_parser.apply_ocr(item[1], item[2]), 0
+                else:
+                    resume_data, skipped_pages = self._parse(resume_path)
+                payload = {'skipped_pages': skipped_pages}
+                if resume_data.get('ocr_pages'):
+                    # apply_ocr only needs the page texts
+                    payload.update({'ocr_pages': resume_data['ocr_pages'],
+                                    'resume': {'page_texts': resume_data['page_texts']}})
+                elif not resume_data['raw_text'].strip():
+                    raise ValueError(f"no text layer ({skipped_pages} scanned page(s)); run with OCR enabled")
+                elif self._deduplicator is None and not self.parse_only:
+                    payload['results'] = self._score(resume_path, resume_data)
+                else:
+                    signature = None
+                    if self._deduplicator is not None:
+                        with matcher._stage('dedupe'):
+                            signature = self._deduplicator.signature(resume_data['raw_text'])
+                    payload['signature'] = None if signature is None else signature.tolist()
+                    if self.parse_only:
+                        payload['resume'] = {field: resume_data[field] for field in RESUME_FIELDS}
+                        payload['text'] = resume_data['document'].cleaned
+                    else:
+                        payload['resume'] = resume_data
+
+        if matcher.profiler is not None:
+            payload['profile'] = matcher.profiler.last_trace.to_dict()
+        return payload
+
+
+class Checkpoint:
+    """
+    Append-only JSONL log of finished resumes, flushed every `every` records
+    """
+
+    def __init__(self, path, run_key, every=100):
+        self.path = path
+        self.run_key = run_key
+        self.every = every
+        self._buffer = []
+
+    def load(self):
+        """Return {resume path: record} from a previous run with the same run key"""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            try:
+                run_key = json.loads(header).get('run_key')
+            except ValueError:
+                run_key = None
+            if run_key != self.run_key:
+                raise ValueError(
+                    f"{self.path} belongs to a different set of job descriptions or settings; "
+                    "use another output directory or --restart"
+                )
+
+            complete = f.tell()  # end of the last newline-terminated line
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn last line from a crash
+                complete = f.tell()
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # garbage left by an older crash; later records are still valid
+                records[record['path']] = record
+
+        # Drop a torn tail so new records are not appended onto it
+        if os.path.getsize(self.path) > complete:
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+        return records
+
+    def start(self, restart=False):
+        if restart or not os.path.exists(self.path):
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'run_key': self.run_key}) + "\n")
+
+    def add(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.every:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in self._buffer:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._buffer = []
+
+
+class ProgressReporter:
+    """Prints done/total, throughput and ETA at most every `interval` seconds"""
+
+    def __init__(self, total, already_done=0, interval=2.0, stream=sys.stdout):
+        self.total = total
+        self.done = already_done
+        self.session_start_done = already_done
+        self.interval = interval
+        self.stream = stream
+        self.start = time.monotonic()
+        self._last = 0.0
+
+    def update(self, n=1, force=False):
+        self.done += n
+        now = time.monotonic()
+        if not force and now - self._last < self.interval and self.done < self.total:
+            return
+        self._last = now
+
+        elapsed = max(now - self.start, 1e-9)
+        rate = (self.done - self.session_start_done) / elapsed
+        remaining = self.total - self.done
+        eta = remaining / rate if rate > 0 else float('inf')
+        percent = self.done / self.total * 100 if self.total else 100.0
+
+        eta_text = "--" if eta == float('inf') else f"{int(eta // 60)}m{int(eta % 60):02d}s"
+        print(f"[{self.done:>7}/{self.total}] {percent:5.1f}% | {rate:7.1f} docs/s | ETA {eta_text}",
+              file=self.stream, flush=True)
+
+
+def run_batch(resume_paths, jd_paths, output_dir, workers=None, checkpoint_every=100,
+              timeout=60, memory_limit_mb=1024, dedupe_threshold=0.9, restart=False,
+              weights=None, thresholds=None, profiler=None, ocr=False, ocr_cache_dir=None,
+              chunk_size=1000, feature_store_dir=None, ocr_workers=2):
+    """
+    Rank resume_paths against every JD with checkpointing and progress output
+    With ocr, scanned pages are OCRed on one pool of ocr_workers threads in
+    this process while the workers go on with text-layer resumes; OCRed
+    resumes are scored once every text-layer resume is done.
+    With dedupe on, each chunk of resumes is parsed first and only one
+    representative per near-duplicate group is scored. With
+    feature_store_dir, text similarity comes from a feature store of the
+    parsed pool written there (see score_with_feature_store). With a
+    profiling.DocumentProfiler, worker traces for every processed resume are
+    collected into it (traces are not checkpointed).
+    Returns:
+        {jd name: candidates sorted by overall score}
+    """
+    from dedup import ResumeDeduplicator
+
+    ocr_queue = None
+    if ocr:
+        from Parser import ocr as ocr_module
+        if ocr_module.pytesseract is None:
+            raise ValueError("OCR needs pytesseract and pdf2image: pip install pytesseract pdf2image")
+        ocr_queue = ocr_module.OCRQueue(max_workers=ocr_workers, cache_dir=ocr_cache_dir)
+
+    os.makedirs(output_dir, exist_ok=True)
+    names = jd_names(jd_paths)
+    jd_texts = {}
+    for jd_path, name in names.items():
+        with open(jd_path, 'r', encoding='utf-8') as f:
+            jd_texts[name] = f.read()
+
+    run_key = hashlib.sha256(json.dumps(
+        [jd_texts, dedupe_threshold, weights, thresholds, bool(ocr), feature_store_dir is not None], sort_keys=True
+    ).encode('utf-8')).hexdigest()
+
+    checkpoint = Checkpoint(os.path.join(output_dir, CHECKPOINT_FILE), run_key, every=checkpoint_every)
+    records = {} if restart else checkpoint.load()
+    checkpoint.start(restart=restart)
+
+    texts = None
+    if feature_store_dir is not None:
+        # Texts are checkpointed separately; a restored representative whose
+        # text never reached the disk is parsed again
+        text_log = Checkpoint(os.path.join(output_dir, TEXTS_FILE), run_key, every=checkpoint_every)
+        texts = {} if restart else {path: entry['text'] for path, entry in text_log.load().items()}
+        text_log.start(restart=restart)
+        records = {
+            path: record for path, record in records.items()
+            if record['status'] != 'ok' or record.get('duplicate_of') or path in texts
+        }
+
+    deduplicator = ResumeDeduplicator(threshold=dedupe_threshold) if dedupe_threshold else None
+    if deduplicator is not None:
+        for record in records.values():
+            if record.get('signature') and not record.get('duplicate_of'):
+                deduplicator.add(record['path'], signature=record['signature'])
+
+    pending = [path for path in resume_paths if path not in records]
+    print(f" {len(records)} resumes restored from checkpoint, {len(pending)} to process")
+
+    # Most expensive documents first; idle workers pull the next one from the shared queue
+    pending = largest_first(pending)
+
+    progress = ProgressReporter(len(resume_paths), already_done=len(resume_paths) - len(pending))
+    task = BatchScoringTask(jd_texts, dedupe_threshold, weights, thresholds, profile=profiler is not None,
+                            ocr=ocr, parse_only=texts is not None)
+    traces = {}   # resume path -> parse trace waiting for its scoring trace
+    ocr_jobs = []   # (resume path, text-layer data, OCR future)
+    skipped_pages = 0
+
+    def collect_trace(resume_path, payload, final=True):
+        trace = payload.pop('profile', None)
+        if trace is not None:
+            from profiling import DocumentTrace
+            trace = DocumentTrace.from_dict(trace)
+            if resume_path in traces:
+                trace = traces.pop(resume_path).merge(trace)
+        elif final and resume_path in traces:
+            trace = traces.pop(resume_path)
+        else:
+            return
+        if final:
+            profiler.add(trace)
+        else:
+            traces[resume_path] = trace
+
+    def finish(record):
+        records[record['path']] = record
+        checkpoint.add(record)
+        progress.update()
+
+    def failed(resume_path, status, payload):
+        traces.pop(resume_path, None)
+        print(f"❌ Error processing {resume_path} ({status}): {payload}")
+        finish({'path': resume_path, 'status': status, 'error': payload})
+
+    def score_representatives(pool, parsed):
+        """Score one representative per group in parsed; returns the items to re-queue"""
+        chunk_groups = ResumeDeduplicator(threshold=dedupe_threshold)
+        held = {}   # representative path -> its not yet recorded duplicates
+        to_score = []
+        signatures = {}
+        for resume_path, signature, payload in parsed:
+            original = group = None
+            if signature is not None:
+                original = deduplicator.find_duplicate(signature=signature)
+                if original is None:
+                    group = chunk_groups.add(resume_path, signature=signature)
+            if original is not None:
+                collect_trace(resume_path, payload)
+                finish({'path': resume_path, 'status': 'ok', 'duplicate_of': original})
+            elif group is not None:
+                held[group].append((resume_path, signature, payload))
+            else:
+                collect_trace(resume_path, payload, final=False)
+                held[resume_path] = []
+                signatures[resume_path] = signature
+                to_score.append((resume_path, payload['resume']))
+
+        requeue = []
+        for (resume_path, _), status, payload in pool.map(to_score):
+            if status != 'ok':
+                failed(resume_path, status, payload)
+                # Its duplicates become independent candidates again
+                requeue += held[resume_path]
+                continue
+            signature = signatures[resume_path]
+            if signature is not None:
+                deduplicator.add(resume_path, signature=signature)
+            collect_trace(resume_path, payload)
+            finish({'path': resume_path, 'status': status, 'results': payload['results'],
+                    'signature': signature})
+            for duplicate_path, _, duplicate_payload in held[resume_path]:
+                collect_trace(duplicate_path, duplicate_payload)
+                finish({'path': duplicate_path, 'status': 'ok', 'duplicate_of': resume_path})
+        return requeue
+
+    def process(pool, items):
+        """Parse and score one chunk of resume paths or OCRed items"""
+        nonlocal skipped_pages
+        parsed = []   # (path, signature, payload) of resumes parsed for dedupe
+
+        for item, status, payload in pool.map(items):
+            resume_path = item[0] if isinstance(item, tuple) else item
+            if status != 'ok':
+                failed(resume_path, status, payload)
+                continue
+
+            skipped_pages += payload.pop('skipped_pages', 0)
+            if 'ocr_pages' in payload:
+                # OCR runs here while the workers go on with text-layer resumes
+                collect_trace(resume_path, payload, final=False)
+                ocr_jobs.append((resume_path, payload['resume'],
+                                 ocr_queue.submit(resume_path, payload['ocr_pages'])))
+                continue
+            if 'results' in payload:
+                collect_trace(resume_path, payload)
+                finish({'path': resume_path, 'status': status, 'results': payload['results']})
+                continue
+
+            signature = payload['signature']
+            if texts is None:
+                parsed.append((resume_path, signature, payload))
+                continue
+
+            # Scored against the feature store once the whole pool is parsed
+            original = None
+            if signature is not None:
+                original = deduplicator.add(resume_path, signature=signature)
+            collect_trace(resume_path, payload)
+            if original is not None:
+                finish({'path': resume_path, 'status': status, 'duplicate_of': original})
+            else:
+                texts[resume_path] = payload['text']
+                text_log.add({'path': resume_path, 'text': payload['text']})
+                finish({'path': resume_path, 'status': status, 'resume': payload['resume'],
+                                'signature': signature})
+
+        # Only one representative per near-duplicate group is scored. A representative
+        # is registered once it has scored; if it fails, its duplicates are re-queued
+        while parsed:
+            parsed = score_representatives(pool, parsed)
+
+    try:
+        with SupervisedPool(task, workers=workers, timeout=timeout, memory_limit_mb=memory_limit_mb) as pool:
+            step = chunk_size if deduplicator is not None and texts is None else max(len(pending), 1)
+            for chunk_start in range(0, len(pending), step):
+                process(pool, pending[chunk_start:chunk_start + step])
+
+            # Scanned resumes, once the text-layer ones are done
+            ocred = []
+            for resume_path, resume_data, future in ocr_jobs:
+                try:
+                    ocred.append((resume_path, resume_data, future.result()))
+                except Exception as e:
+                    failed(resume_path, 'ocr', f"{type(e).__name__}: {e}")
+            if ocred:
+                print(f" Scoring {len(ocred)} OCRed resume(s)")
+            for chunk_start in range(0, len(ocred), step):
+                process(pool, ocred[chunk_start:chunk_start + step])
+
+        print_utilization(pool)
+    finally:
+        if ocr_queue is not None:
+            ocr_queue.shutdown(wait=False)
+        if texts is not None:
+            text_log.flush()
+        checkpoint.flush()
+
+    if skipped_pages:
+        print(f"⚠️  {skipped_pages} scanned page(s) without a text layer were skipped; run with OCR (--ocr) to read them")
+    if not pending:
+        progress.update(0, force=True)
+    current = {path: records[path] for path in resume_paths if path in records}
+    if texts is not None:
+        score_with_feature_store(current, texts, jd_texts, feature_store_dir, weights, thresholds)
+    return assemble_rankings(current, list(names.values()))
+
+
+def score_with_feature_store(records, texts, jd_texts, store_dir, weights=None, thresholds=None):
+    """
+    Write the parsed pool to store_dir as a pairwise feature store and score
+    every JD against it; fills each representative's record['results'] in
+    memory (the checkpoint keeps only parsed fields). Text similarity equals
+    calculate_text_similarity's, without one vectorizer fit per resume and JD.
+    """
+    import numpy as np
+
+    from feature_store import FeatureStore
+    from matcher import CandidateMatcher
+    from Parser.document import AnalyzedDocument
+
+    paths = [
+        path for path, record in records.items()
+        if record['status'] == 'ok' and not record.get('duplicate_of')
+    ]
+    if not paths:
+        return
+
+    matcher = CandidateMatcher(weights=weights, thresholds=thresholds)
+    matcher.vectorizer.build_feature_store([texts[path] for path in paths], store_dir, doc_ids=paths,
+                                           pairwise=True)
+    store = FeatureStore(store_dir)
+
+    for name, jd_text in jd_texts.items():
+        jd_data = matcher.jd_parser.parse_text(jd_text)
+        jd_document = jd_data.get('document', jd_data['raw_text'])
+        similarities = matcher.vectorizer.pairwise_store_similarity(store, jd_document)
+        for path, similarity in zip(store.doc_ids, similarities):
+            record = records[path]
+            if record['status'] != 'ok':
+                continue
+            try:
+                if np.isnan(similarity):
+                    # Pairs the store cannot reproduce are fitted the usual way
+                    similarity = matcher.calculate_text_similarity(AnalyzedDocument.from_cleaned(texts[path]),
+                                                                   jd_document)
+                record.setdefault('results', {})[name] = matcher.score_candidate(
+                    record['resume'], jd_data, path, text_similarity=similarity
+                )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"❌ Error processing {path} (error): {error}")
+                record.update({'status': 'error', 'error': error})
+    print(f" Feature store with {len(paths)} resumes written to: {store_dir}")
+
+
+def assemble_rankings(records, names):
+    """Build sorted per-JD rankings from checkpoint records, folding in duplicates"""
+    duplicates = {}
+    for record in records.values():
+        if record['status'] == 'ok' and record.get('duplicate_of'):
+            duplicates.setdefault(record['duplicate_of'], []).append(os.path.basename(record['path']))
+
+    rankings = {name: [] for name in names}
+    for record in records.values():
+        if record['status'] != 'ok' or record.get('duplicate_of'):
+            continue
+        for name in names:
+            result = dict(record['results'][name])
+            result['duplicates'] = duplicates.get(record['path'], [])
+            rankings[name].append(result)
+
+    for candidates in rankings.values():
+        candidates.sort(key=lambda x: x['overall_score'], reverse=True)
+    return rankings
@@ -0,0 +1,155 @@
+"""
+Fuzz / benchmark run for the extraction regexes in Parser/patterns.py.
+
+Every extractor is timed on adversarial inputs (number tables, long
+tokens, dotted runs, whitespace floods) at doubling sizes. Linear code
+takes ~2x longer per doubling; a quadratic blowup takes ~4x. The run fails
+if any extractor grows faster than MAX_GROWTH per doubling. Random inputs
+are also checked against known answers planted in noise.
+
+Usage:
+    python benchmark_patterns.py [--base-size 20000] [--doublings 4] [--legacy]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from Parser.resume_parser import ResumeParser
+from Parser.job_description_parser import JobDescriptionParser
+from text_vectorizer import TextVectorizer
+
+MAX_GROWTH = 3.0   # allowed time ratio per doubling of input size
+REPEATS = 3
+
+# Adversarial inputs, built to size n
+ADVERSARIAL = {
+    'digit run': lambda n: "1" * n,
+    'spaced digits': lambda n: ("1 " * (n // 2))[:n],
+    'number table': lambda n: ("2019 2020 2021 (12) - 34\n" * (n // 25 + 1))[:n],
+    'digit then spaces': lambda n: ("1" + " " * 99) * (n // 100),
+    'long token': lambda n: "a" * n,
+    'dotted run': lambda n: ("a." * (n // 2))[:n],
+    'at without domain': lambda n: ("a" * 50 + "@") * (n // 51),
+    'years without experience': lambda n: ("5 years " * (n // 8))[:n],
+    'experience without years': lambda n: ("experience: 5 " * (n // 14))[:n],
+    'whitespace flood': lambda n: "5" + " " * n + "years",
+    'header flood': lambda n: ("Skills\n   work   experience:\nEducation x\n" * (n // 38 + 1))[:n],
+}
+
+LEGACY = {
+    'phone (vectorizer)': re.compile(r'\+?\d[\d\s\-\(\)]+\d'),
+    'email (vectorizer)': re.compile(r'\S+@\S+'),
+    'email (parser)': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+}
+
+
+def build_extractors():
+    resume_parser = ResumeParser()
+    jd_parser = JobDescriptionParser()
+    vectorizer = TextVectorizer()
+    return {
+        'parse text': resume_parser.parse_text,
+        'contact info': resume_parser.extract_contact_info,
+        'experience years': resume_parser.extract_experience_years,
+        'required experience': jd_parser.extract_required_experience,
+        'preprocess text': vectorizer.preprocess_text,
+    }
+
+
+def best_time(func, text):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth(func, make_input, base_size, doublings):
+    """Worst time ratio between consecutive doublings, plus the largest time"""
+    times = [best_time(func, make_input(base_size * 2 ** i)) for i in range(doublings + 1)]
+    # Ignore timer noise on very fast runs
+    ratios = [b / max(a, 1e-4) for a, b in zip(times, times[1:])]
+    return max(ratios), times[-1]
+
+
+def fuzz_planted(extractors, rounds=200, seed=0):
+    """Plant a known email / experience in random noise and check they are found"""
+    rng = random.Random(seed)
+    alphabet = "abc 123-().@+\n\t:"
+    failures = 0
+    for _ in range(rounds):
+        noise = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        years = rng.randint(1, 30)
+        text = f"{noise}\nJane Doe jane.doe@example.com\n{years} years of experience\n"
+
+        contact = extractors['contact info'](text)
+        found_years = extractors['experience years'](text)
+        if contact['email'] is None or found_years == 0:
+            failures += 1
+            print(f"❌ planted values not found in: {text[:80]!r}...")
+    return failures
+
+
+def fuzz_cleanup(rounds=500, seed=0):
+    """Phone-number cleanup must strip exactly what the original pattern stripped"""
+    from Parser import patterns
+
+    rng = random.Random(seed)
+    alphabet = "0123456789 -()+ab\n"
+    failures = 0
+    for _ in range(rounds):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+        if patterns.PHONE_LIKE.sub('', text) != LEGACY['phone (vectorizer)'].sub('', text):
+            failures += 1
+            print(f"❌ phone cleanup differs on: {text[:80]!r}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check extraction regexes stay linear on adversarial input")
+    parser.add_argument('--base-size', type=int, default=20000, help="Smallest input size in characters")
+    parser.add_argument('--doublings', type=int, default=4, help="Number of size doublings")
+    parser.add_argument('--legacy', action='store_true',
+                        help="Also time the old unbounded patterns for comparison (can be slow)")
+    args = parser.parse_args(argv)
+
+    extractors = build_extractors()
+    largest = args.base_size * 2 ** args.doublings
+    failed = []
+
+    print("=" * 80)
+    print(f"REGEX LINEARITY CHECK ({args.base_size} -> {largest} chars, max growth {MAX_GROWTH}x)")
+    print("=" * 80)
+
+    for input_name, make_input in ADVERSARIAL.items():
+        for extractor_name, func in extractors.items():
+            ratio, largest_time = growth(func, make_input, args.base_size, args.doublings)
+            ok = ratio <= MAX_GROWTH
+            if not ok:
+                failed.append((input_name, extractor_name))
+            print(f"{'✅' if ok else '❌'} {input_name:26s} {extractor_name:20s} "
+                  f"growth {ratio:4.1f}x  {largest_time * 1000:8.1f} ms")
+
+    if args.legacy:
+        print("\n📊 Legacy patterns (for comparison)")
+        for input_name, make_input in ADVERSARIAL.items():
+            for pattern_name, pattern in LEGACY.items():
+                ratio, largest_time = growth(pattern.findall, make_input, args.base_size // 8, 3)
+                print(f"   {input_name:26s} {pattern_name:20s} growth {ratio:4.1f}x  {largest_time * 1000:8.1f} ms")
+
+    print("\n📊 Planted-value fuzzing")
+    fuzz_failures = fuzz_planted(extractors) + fuzz_cleanup()
+    print(f"{'✅' if not fuzz_failures else '❌'} {fuzz_failures} failures")
+
+    if failed or fuzz_failures:
+        print(f"\n❌ {len(failed)} super-linear case(s): {failed}")
+        return 1
+    print("\n✅ All extractors stay linear")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
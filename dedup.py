@@ -0,0 +1,173 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Each resume is reduced to a fixed-size MinHash signature over its word
+shingles. Signatures are split into bands and every band is hashed into a
+bucket, so a new resume is only compared against the few resumes that share
+at least one bucket with it instead of against the whole pool.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+# Mersenne prime 2^61 - 1 used by the classic MinHash permutation scheme
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def choose_bands(num_perm, threshold):
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH S-curve
+    threshold (1 / bands) ** (1 / rows) is closest to the requested cutoff
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class ResumeDeduplicator:
+    """
+    Groups near-duplicate resumes and keeps one representative per group
+    """
+
+    def __init__(self, threshold=0.9, num_perm=128, shingle_size=5, seed=1):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at which two resumes are duplicates
+            num_perm: Number of MinHash permutations (signature length)
+            shingle_size: Words per shingle
+            seed: Seed for the permutation coefficients
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+        self.groups = {}  # representative key -> list of duplicate keys
+
+    def shingles(self, text):
+        """Set of hashed word shingles of the lowercased text"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < self.shingle_size:
+            pieces = [' '.join(words)] if words else []
+        else:
+            pieces = [
+                ' '.join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            ]
+
+        return {
+            int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+            for s in pieces
+        }
+
+    def signature(self, text):
+        """
+        MinHash signature (uint64 array of length num_perm) for a text
+        Returns None for a text without words: empty documents are never
+        duplicates of each other.
+        """
+        hashed = np.fromiter(self.shingles(text), dtype=np.uint64)
+        if hashed.size == 0:
+            return None
+
+        # (a * x + b) mod p for every permutation and shingle at once;
+        # uint64 wrap-around on a * x is part of the hash, not an error
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashed, self._a) + self._b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def find_duplicate(self, text=None, signature=None):
+        """
+        Return the representative key a text duplicates, or None
+        Only resumes sharing an LSH bucket with the text are compared.
+        """
+        if signature is None:
+            signature = self.signature(text or "")
+        if signature is None:
+            return None
+        signature = np.asarray(signature, dtype=np.uint64)
+
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_key, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best_key, best_similarity = candidate, similarity
+
+        return best_key
+
+    def add(self, key, text=None, signature=None):
+        """
+        Register a resume by text or by a precomputed signature
+        Texts without words are not registered and never match.
+        Returns:
+            Key of the representative it duplicates, or None if it starts a new group
+        """
+        if signature is None:
+            signature = self.signature(text or "")
+        if signature is None:
+            return None
+        signature = np.asarray(signature, dtype=np.uint64)
+        original = self.find_duplicate(signature=signature)
+
+        if original is not None:
+            self.groups[original].append(key)
+            return original
+
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+        self.groups[key] = []
+
+        return None
+
+
+# Test the deduplicator
+if __name__ == "__main__":
+    base = (
+        "Experienced Python developer with 5 years of experience in machine learning "
+        "and data science. Proficient in TensorFlow, PyTorch, and scikit-learn. "
+        "Built multiple NLP models for text classification and sentiment analysis."
+    )
+
+    resumes = {
+        'alice.pdf': base,
+        'alice_v2.pdf': base + " Available immediately.",
+        'bob.pdf': "Java developer with web development skills in Spring and React.",
+        'scan_1.pdf': "",
+        'scan_2.pdf': "",
+    }
+
+    deduplicator = ResumeDeduplicator(threshold=0.8)
+    print(f"LSH bands: {deduplicator.bands} x {deduplicator.rows} rows")
+
+    for name, text in resumes.items():
+        original = deduplicator.add(name, text)
+        status = f"duplicate of {original}" if original else "new group"
+        print(f"   {name}: {status}")
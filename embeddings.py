@@ -0,0 +1,277 @@
+"""
+Optional dense-embedding similarity backend with a local ANN index.
+
+EmbeddingBackend wraps a locally stored sentence-transformers model running
+on CPU. Texts are embedded in batches and every vector is cached by the
+SHA-1 of the model name and text, in a bounded in-memory LRU and optionally
+on disk, so a resume is never embedded twice by the same model.
+
+IVFFlatIndex is an inverted-file index in plain NumPy: vectors are grouped
+around k-means centroids and a query only scans the n_probe closest lists.
+It is saved as .npy files next to the resume pool and memory-mapped on load.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+ASSIGN_CHUNK_ROWS = 65536   # vectors scored against the centroids at a time
+
+
+def text_hash(text, model_name=""):
+    """Stable cache key for a document's text as embedded by model_name"""
+    return hashlib.sha1(f"{model_name}\0{text or ''}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingBackend:
+    """
+    CPU sentence embeddings with batched inference and a per-text cache
+    """
+
+    def __init__(self, model_path, batch_size=32, cache_dir=None, model=None, model_name=None,
+                 max_cached=10000):
+        """
+        Args:
+            model_path: Local directory (or cached name) of a sentence-transformers model
+            batch_size: Texts per inference batch
+            cache_dir: Optional directory for persisted vectors (<hash>.npy)
+            model: Already loaded model exposing encode(); skips loading model_path
+            model_name: Model identity in cache keys (defaults to the model path's base name)
+            max_cached: Vectors kept in memory; least recently used ones are dropped first
+        """
+        if model is None:
+            if SentenceTransformer is None:
+                raise ImportError(
+                    "Dense embeddings need sentence-transformers: "
+                    "pip install sentence-transformers"
+                )
+            model = SentenceTransformer(model_path, device='cpu', local_files_only=True)
+
+        self.model = model
+        self.model_name = model_name or os.path.basename(os.path.normpath(model_path or type(model).__name__))
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _remember(self, key, vector):
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def _cached(self, key):
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                return vector
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            if os.path.exists(path):
+                vector = np.load(path)
+                self._remember(key, vector)
+                return vector
+        return None
+
+    def _store(self, key, vector):
+        self._remember(key, vector)
+        if self.cache_dir:
+            np.save(os.path.join(self.cache_dir, f"{key}.npy"), vector)
+
+    def embed(self, texts):
+        """
+        Embed a list of texts
+        Returns:
+            float32 array (len(texts), dim) of L2-normalised vectors
+        """
+        keys = [text_hash(text, self.model_name) for text in texts]
+        vectors = [self._cached(key) for key in keys]
+
+        # Embed each distinct uncached text once, in batches
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text or ""
+
+        if missing:
+            encoded = self.model.encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            encoded = np.asarray(encoded, dtype=np.float32)
+            for key, vector in zip(missing, encoded):
+                self._store(key, vector)
+            # Fill from this batch directly: the LRU may already have dropped some of them
+            fresh = dict(zip(missing, encoded))
+            vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+    def similarity(self, text1, text2):
+        """
+        Cosine similarity between two texts
+        Returns: Similarity score (0-100)
+        """
+        vectors = self.embed([text1, text2])
+        similarity = float(np.dot(vectors[0], vectors[1]))
+        return round(max(similarity, 0.0) * 100, 2)
+
+
+def assign_centroids(vectors, centroids, chunk_rows=ASSIGN_CHUNK_ROWS):
+    """Index of the closest centroid per vector, scoring chunk_rows vectors at a time"""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_rows):
+        assignments[start:start + chunk_rows] = np.argmax(vectors[start:start + chunk_rows] @ centroids.T, axis=1)
+    return assignments
+
+
+class IVFFlatIndex:
+    """
+    Inverted-file ANN index over L2-normalised vectors (inner product search)
+    """
+
+    def __init__(self, n_lists=None, n_probe=8, seed=0):
+        """
+        Args:
+            n_lists: Number of k-means lists (defaults to ~sqrt(n_vectors))
+            n_probe: Lists scanned per query; higher is slower but more exact
+            seed: Seed for centroid initialisation
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+
+        self.centroids = None
+        self.vectors = None     # vectors reordered so each list is contiguous
+        self.offsets = None     # list i occupies vectors[offsets[i]:offsets[i + 1]]
+        self.ids = None         # id per reordered vector
+
+    def __len__(self):
+        return 0 if self.vectors is None else len(self.vectors)
+
+    def build(self, vectors, ids, n_iter=10):
+        """
+        Cluster vectors with spherical k-means and lay out the inverted lists
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = [str(i) for i in ids]
+        if len(ids) != len(vectors):
+            raise ValueError("ids must have one entry per vector")
+
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+
+        rng = np.random.RandomState(self.seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignments = assign_centroids(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            norms = np.linalg.norm(sums, axis=1)
+            filled = norms > 0   # empty lists keep their previous centroid
+            centroids[filled] = sums[filled] / norms[filled, None]
+
+        assignments = assign_centroids(vectors, centroids)
+        order = np.argsort(assignments, kind='stable')
+
+        self.centroids = centroids
+        self.vectors = vectors[order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=n_lists))))
+        self.ids = [ids[i] for i in order]
+
+        return self
+
+    def search(self, query, k=10):
+        """
+        Approximate top-k neighbours of a normalised query vector
+        Returns:
+            List of (id, similarity 0-100), best first
+        """
+        if not len(self):
+            return []
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        n_probe = min(self.n_probe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+
+        positions = np.concatenate([
+            np.arange(self.offsets[i], self.offsets[i + 1]) for i in probe
+        ])
+        if positions.size == 0:
+            return []
+
+        scores = np.asarray(self.vectors[positions] @ query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [
+            (self.ids[positions[i]], round(max(float(scores[i]), 0.0) * 100, 2))
+            for i in top
+        ]
+
+    def save(self, index_dir):
+        """Persist the index as .npy files plus ids/settings JSON"""
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, "centroids.npy"), self.centroids)
+        np.save(os.path.join(index_dir, "vectors.npy"), self.vectors)
+        np.save(os.path.join(index_dir, "offsets.npy"), self.offsets)
+
+        with open(os.path.join(index_dir, "index.json"), 'w', encoding='utf-8') as f:
+            json.dump({'ids': self.ids, 'n_probe': self.n_probe, 'seed': self.seed}, f)
+
+    @classmethod
+    def load(cls, index_dir):
+        """Open a saved index; vectors are memory-mapped, not read up front"""
+        with open(os.path.join(index_dir, "index.json"), 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+
+        index = cls(n_probe=settings['n_probe'], seed=settings['seed'])
+        index.centroids = np.load(os.path.join(index_dir, "centroids.npy"))
+        index.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode='r')
+        index.offsets = np.load(os.path.join(index_dir, "offsets.npy"))
+        index.ids = settings['ids']
+        index.n_lists = len(index.centroids)
+
+        return index
+
+
+# Test the IVF index on random vectors
+if __name__ == "__main__":
+    import tempfile
+
+    rng = np.random.RandomState(42)
+    vectors = rng.randn(2000, 64).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"resume_{i}.pdf" for i in range(len(vectors))]
+
+    index = IVFFlatIndex(n_probe=8).build(vectors, ids)
+    print(f"Built IVF index: {len(index)} vectors in {len(index.centroids)} lists")
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index.save(index_dir)
+        index = IVFFlatIndex.load(index_dir)
+
+        query = vectors[123]
+        exact = np.argsort(-(vectors @ query))[:5]
+        print("Exact top-5:", [ids[i] for i in exact])
+        print("IVF top-5:  ", [doc_id for doc_id, _ in index.search(query, k=5)])
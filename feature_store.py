@@ -0,0 +1,179 @@
+"""
+On-disk CSR feature store for the resume pool.
+
+Layout of a store directory (written by TextVectorizer.build_feature_store):
+    data.npy        float32 non-zero TF-IDF values (rows are L2-normalised), or
+                    raw term counts in a pairwise store
+    indices.npy     column index of every non-zero value
+    indptr.npy      row pointers (n_docs + 1)
+    doc_ids.json    id of every row (usually the resume file name)
+    vectorizer.pkl  the fitted sklearn vectorizer used to build the rows
+    meta.json       shape, method, dtypes and whether rows hold raw counts
+
+The arrays are opened with np.memmap, so scoring a JD only touches the
+pages it reads: RSS stays bounded, pages are shared between processes and
+opening a store of millions of resumes is near-instant.
+"""
+import json
+import os
+import pickle
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+DATA_FILE = "data.npy"
+INDICES_FILE = "indices.npy"
+INDPTR_FILE = "indptr.npy"
+DOC_IDS_FILE = "doc_ids.json"
+VECTORIZER_FILE = "vectorizer.pkl"
+META_FILE = "meta.json"
+
+
+def write_feature_store(store_dir, matrix, doc_ids, fitted_vectorizer, method, counts=False):
+    """
+    Write a sparse document-term matrix to store_dir as CSR .npy files
+    With counts, rows are stored as raw term counts instead of L2-normalised.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+
+    matrix = csr_matrix(matrix, dtype=np.float32)
+    if not counts:
+        # Normalise rows once at write time so cosine similarity is a dot product
+        matrix = normalize(matrix, norm='l2', copy=False)
+    matrix.sort_indices()
+
+    np.save(os.path.join(store_dir, DATA_FILE), matrix.data.astype(np.float32))
+    # indices and indptr share one dtype so scipy never has to copy them
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    np.save(os.path.join(store_dir, INDICES_FILE), matrix.indices.astype(index_dtype))
+    np.save(os.path.join(store_dir, INDPTR_FILE), matrix.indptr.astype(index_dtype))
+
+    with open(os.path.join(store_dir, DOC_IDS_FILE), 'w', encoding='utf-8') as f:
+        json.dump([str(doc_id) for doc_id in doc_ids], f)
+
+    with open(os.path.join(store_dir, VECTORIZER_FILE), 'wb') as f:
+        pickle.dump(fitted_vectorizer, f)
+
+    with open(os.path.join(store_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'n_docs': matrix.shape[0],
+            'n_features': matrix.shape[1],
+            'nnz': int(matrix.nnz),
+            'method': method,
+            'counts': counts,
+        }, f, indent=2)
+
+
+class FeatureStore:
+    """
+    Read-only, memory-mapped view of a resume feature store
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+        with open(os.path.join(store_dir, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        # np.load with mmap_mode returns np.memmap arrays - nothing is read yet
+        self.data = np.load(os.path.join(store_dir, DATA_FILE), mmap_mode='r')
+        self.indices = np.load(os.path.join(store_dir, INDICES_FILE), mmap_mode='r')
+        self.indptr = np.load(os.path.join(store_dir, INDPTR_FILE), mmap_mode='r')
+
+        with open(os.path.join(store_dir, DOC_IDS_FILE), 'r', encoding='utf-8') as f:
+            self.doc_ids = json.load(f)
+
+        self._vectorizer = None
+
+    def __len__(self):
+        return self.meta['n_docs']
+
+    @property
+    def shape(self):
+        return (self.meta['n_docs'], self.meta['n_features'])
+
+    @property
+    def vectorizer(self):
+        """Fitted sklearn vectorizer, loaded on first use"""
+        if self._vectorizer is None:
+            with open(os.path.join(self.store_dir, VECTORIZER_FILE), 'rb') as f:
+                self._vectorizer = pickle.load(f)
+        return self._vectorizer
+
+    def rows(self, start, stop):
+        """
+        CSR matrix for rows [start, stop) backed by the memory-mapped arrays
+        """
+        lo = int(self.indptr[start])
+        hi = int(self.indptr[stop])
+        indptr = np.asarray(self.indptr[start:stop + 1]) - self.indptr.dtype.type(lo)
+        return csr_matrix(
+            (self.data[lo:hi], self.indices[lo:hi], indptr),
+            shape=(stop - start, self.meta['n_features']),
+            copy=False
+        )
+
+    def query_vector(self, processed_text):
+        """Vectorize an already preprocessed query with the store's vocabulary"""
+        query = self.vectorizer.transform([processed_text]).astype(np.float32)
+        return normalize(query, norm='l2', copy=False)
+
+    def score(self, processed_text, chunk_rows=100_000):
+        """
+        Cosine similarity (0-100) of a preprocessed query against every row
+        Args:
+            processed_text: JD text already passed through preprocess_text
+            chunk_rows: Rows scored per chunk; bounds the working set
+        Returns:
+            float32 array of similarity percentages, one per stored document
+        """
+        n_docs = len(self)
+        query_t = self.query_vector(processed_text).T.tocsc()
+        scores = np.empty(n_docs, dtype=np.float32)
+
+        for start in range(0, n_docs, chunk_rows):
+            stop = min(start + chunk_rows, n_docs)
+            chunk_scores = self.rows(start, stop).dot(query_t)
+            scores[start:stop] = chunk_scores.toarray().ravel()
+
+        return np.round(scores * 100, 2)
+
+    def top_k(self, processed_text, k=10, chunk_rows=100_000):
+        """
+        Return the k best (doc_id, similarity) pairs for a preprocessed query
+        """
+        scores = self.score(processed_text, chunk_rows=chunk_rows)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.doc_ids[i], round(float(scores[i]), 2)) for i in top]
+
+
+# Test the feature store
+if __name__ == "__main__":
+    import tempfile
+    from text_vectorizer import TextVectorizer
+
+    resumes = [
+        "Python developer with machine learning experience",
+        "Java developer with web development skills",
+        "Data scientist with NLP and deep learning expertise"
+    ]
+    jd_text = "Machine Learning Engineer with NLP, deep learning and Python"
+
+    vectorizer = TextVectorizer(method='tfidf')
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        vectorizer.build_feature_store(
+            resumes, store_dir, doc_ids=['r1.pdf', 'r2.pdf', 'r3.pdf']
+        )
+
+        store = FeatureStore(store_dir)
+        print(f"Opened store: {len(store)} documents, shape {store.shape}")
+
+        for doc_id, score in vectorizer.score_feature_store(store, jd_text, top_k=3):
+            print(f"   {doc_id}: {score}%")
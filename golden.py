@@ -0,0 +1,465 @@
+"""
+Golden-corpus equivalence checks for every execution mode of the pipeline.
+
+data/golden/corpus.json holds resume and JD texts. At run time the resumes
+are written out as PDF/DOCX files (synthetic.write_document), so every
+check goes through the real parsers. data/golden/expected.json records
+what the reference path - one CandidateMatcher, sequential - returns for
+parse_resume, calculate_skill_match_score, calculate_text_similarity and
+rank_candidates.
+
+Every other execution mode (process pool, resumable batch, cached parses,
+top-k screening, ScoreTable re-ranking, profiling, near-duplicate skipping,
+the batch feature store) runs over the same files and must give the
+reference rankings: the same candidates in the same order and every score
+within the tolerance. Skipped near-duplicates are expanded back with their
+representative's scores, so a wrong merge shows up as a difference.
+
+The dense-embedding backend scores similarity differently by design. Its
+mode runs with HashingEncoder, a deterministic offline stand-in for a
+sentence-transformers model, and is checked against its own recorded
+rankings (embedding_rankings in expected.json). Candidates with equal scores are
+compared in name order, because their relative order is not a ranking
+decision. Each mode's wall time is reported as a speedup over the reference,
+except re-ranking: it starts from already scored results, so it is compared
+with re-scoring those results one candidate at a time in Python.
+
+Usage:
+    python golden.py                 # check every mode, report speedups
+    python golden.py --mode pool     # check selected modes only
+    python golden.py --update        # re-record expected.json after an intended change
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from matcher import CandidateMatcher
+from synthetic import write_document
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "golden")
+CORPUS_FILE = os.path.join(GOLDEN_DIR, "corpus.json")
+EXPECTED_FILE = os.path.join(GOLDEN_DIR, "expected.json")
+
+TOLERANCE = 0.01   # score points
+TOP_K = 5
+RANKING_FIELDS = ('overall_score', 'skill_match_percentage', 'text_similarity',
+                  'experience_match', 'recommendation')
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def materialize(corpus, work_dir):
+    """
+    Write the corpus to disk
+    Returns:
+        (resume folder, {JD name: JD file path})
+    """
+    resume_dir = os.path.join(work_dir, "resumes")
+    jd_dir = os.path.join(work_dir, "job_descriptions")
+    os.makedirs(resume_dir)
+    os.makedirs(jd_dir)
+
+    for filename, text in corpus['resumes'].items():
+        write_document(os.path.join(resume_dir, filename), text)
+
+    jd_paths = {}
+    for name, text in corpus['job_descriptions'].items():
+        jd_paths[name] = os.path.join(jd_dir, f"{name}.txt")
+        write_document(jd_paths[name], text)
+    return resume_dir, jd_paths
+
+
+def resume_summary(resume_data):
+    """The parse_resume fields the scores depend on, in a stable order"""
+    return {
+        'email': resume_data['email'],
+        'phone': resume_data['phone'],
+        'education': resume_data['education'],
+        'experience_years': resume_data['experience_years'],
+        'skills': sorted(resume_data['skills']),
+    }
+
+
+def skill_summary(skill_match):
+    # Skill lists come from sets, so their order is not part of the contract
+    return {
+        'percentage': float(skill_match['percentage']),
+        'matched_skills': sorted(skill_match['matched_skills']),
+        'missing_skills': sorted(skill_match['missing_skills']),
+    }
+
+
+def expand_duplicates(candidates):
+    """Candidates plus one copy of each representative per skipped near-duplicate"""
+    expanded = []
+    for candidate in candidates:
+        expanded.append(candidate)
+        expanded += [{**candidate, 'candidate_name': name} for name in candidate.get('duplicates', [])]
+    return expanded
+
+
+class HashingEncoder:
+    """Deterministic stand-in for a sentence-transformers model: hashed n-gram vectors"""
+
+    def __init__(self, dim=512):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(n_features=dim, ngram_range=(1, 2), stop_words='english',
+                                            alternate_sign=False, norm='l2')
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True,
+               show_progress_bar=False):
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+def ranking_summary(candidates):
+    """Candidates best first, equal scores in name order"""
+    rows = [
+        {'candidate_name': candidate['candidate_name'],
+         **{field: candidate[field] if field == 'recommendation' else float(candidate[field])
+            for field in RANKING_FIELDS}}
+        for candidate in candidates
+    ]
+    return sorted(rows, key=lambda row: (-round(row['overall_score'], 2), row['candidate_name']))
+
+
+def reference_outputs(matcher, resume_dir, jd_paths):
+    """Per-function outputs of the reference path on every resume / JD pair"""
+    resumes = {
+        filename: matcher.resume_parser.parse_resume(os.path.join(resume_dir, filename))
+        for filename in sorted(os.listdir(resume_dir))
+    }
+    jds = {name: matcher.jd_parser.parse_job_description(path) for name, path in jd_paths.items()}
+
+    outputs = {
+        'parse_resume': {filename: resume_summary(data) for filename, data in resumes.items()},
+        'skill_match': {},
+        'text_similarity': {},
+    }
+    for name, jd_data in jds.items():
+        outputs['skill_match'][name] = {
+            filename: skill_summary(matcher.calculate_skill_match_score(data['skills'], jd_data['required_skills']))
+            for filename, data in resumes.items()
+        }
+        outputs['text_similarity'][name] = {
+            filename: float(matcher.calculate_text_similarity(data['raw_text'], jd_data['raw_text']))
+            for filename, data in resumes.items()
+        }
+    return outputs, resumes, jds
+
+
+def compare(expected, actual, tolerance, where="output"):
+    """Differences between two JSON-like values, numbers compared within tolerance"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        problems = []
+        for key in sorted(set(expected) | set(actual)):
+            if key not in actual:
+                problems.append(f"{where}.{key}: missing")
+            elif key not in expected:
+                problems.append(f"{where}.{key}: unexpected")
+            else:
+                problems += compare(expected[key], actual[key], tolerance, f"{where}.{key}")
+        return problems
+
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{where}: expected {expected}, got {actual}"]
+        problems = []
+        for i, (want, got) in enumerate(zip(expected, actual)):
+            problems += compare(want, got, tolerance, f"{where}[{i}]")
+        return problems
+
+    numbers = (int, float)
+    if isinstance(expected, numbers) and isinstance(actual, numbers) \
+            and not isinstance(expected, bool) and not isinstance(actual, bool):
+        if abs(expected - actual) > tolerance:
+            return [f"{where}: expected {expected}, got {actual}"]
+        return []
+
+    if expected != actual:
+        return [f"{where}: expected {expected!r}, got {actual!r}"]
+    return []
+
+
+def compare_rankings(expected, actual, tolerance, limit=None, where="ranking"):
+    """
+    Same candidates in the same order with matching scores
+    With limit, actual must be the top `limit` of expected; any candidate
+    tied with the last place may fill the tied positions.
+    """
+    wanted = expected[:limit] if limit else expected
+    if len(actual) != len(wanted):
+        return [f"{where}: expected {len(wanted)} candidates, got {len(actual)}"]
+
+    by_name = {row['candidate_name']: row for row in expected}
+    cutoff = wanted[-1]['overall_score'] if wanted and limit and len(expected) > limit else None
+
+    problems = []
+    for position, (want, got) in enumerate(zip(wanted, actual), 1):
+        if got['candidate_name'] != want['candidate_name']:
+            tied = by_name.get(got['candidate_name'])
+            if cutoff is None or tied is None \
+                    or abs(want['overall_score'] - cutoff) > tolerance \
+                    or abs(tied['overall_score'] - cutoff) > tolerance:
+                problems.append(f"{where} #{position}: expected {want['candidate_name']} "
+                                f"({want['overall_score']}), got {got['candidate_name']} ({got['overall_score']})")
+                continue
+            want = tied
+        problems += compare(want, got, tolerance, f"{where} #{position} {got['candidate_name']}")
+    return problems
+
+
+def check_bounds(matcher, resumes, jds, tolerance):
+    """The top-k / min_score screen must never discard a candidate that could qualify"""
+    problems = []
+    for name, jd_data in jds.items():
+        for filename, resume_data in resumes.items():
+            bound = matcher.score_upper_bound(resume_data, jd_data)
+            score = matcher.score_candidate(resume_data, jd_data, filename)['overall_score']
+            if bound < score - tolerance:
+                problems.append(f"score_upper_bound.{name}.{filename}: bound {bound} below score {score}")
+    return problems
+
+
+class Run:
+    """Shared state for the execution modes"""
+
+    def __init__(self, matcher, resume_dir, jd_paths, work_dir, workers):
+        self.matcher = matcher
+        self.resume_dir = resume_dir
+        self.jd_paths = jd_paths
+        self.work_dir = work_dir
+        self.workers = workers
+        self.resume_paths = sorted(os.path.join(resume_dir, name) for name in os.listdir(resume_dir))
+        self.reference = None  # raw sequential results, input of the re-rank mode
+
+
+def mode_sequential(run):
+    return {name: run.matcher.rank_candidates(run.resume_dir, path) for name, path in run.jd_paths.items()}
+
+
+def mode_pool(run):
+    from workers import SupervisedPool
+
+    with SupervisedPool(workers=run.workers) as pool:
+        return {name: run.matcher.rank_candidates(run.resume_dir, path, pool=pool)
+                for name, path in run.jd_paths.items()}
+
+
+def mode_batch(run):
+    from batch import run_batch
+
+    output_dir = os.path.join(run.work_dir, "batch")
+    return run_batch(run.resume_paths, list(run.jd_paths.values()), output_dir,
+                     workers=run.workers, dedupe_threshold=None, restart=True)
+
+
+def mode_batch_dedupe(run):
+    from batch import run_batch
+
+    output_dir = os.path.join(run.work_dir, "batch_dedupe")
+    rankings = run_batch(run.resume_paths, list(run.jd_paths.values()), output_dir,
+                         workers=run.workers, restart=True)
+    return {name: expand_duplicates(candidates) for name, candidates in rankings.items()}
+
+
+def mode_feature_store(run):
+    from batch import run_batch
+
+    output_dir = os.path.join(run.work_dir, "feature_store")
+    return run_batch(run.resume_paths, list(run.jd_paths.values()), output_dir,
+                     workers=run.workers, dedupe_threshold=None, restart=True,
+                     feature_store_dir=os.path.join(output_dir, "store"))
+
+
+def mode_dedupe(run):
+    return {name: expand_duplicates(run.matcher.rank_candidates(run.resume_dir, path, dedupe=True))
+            for name, path in run.jd_paths.items()}
+
+
+def mode_embedding(run):
+    from embeddings import EmbeddingBackend
+
+    matcher = CandidateMatcher(weights=run.matcher.weights, thresholds=run.matcher.thresholds)
+    matcher.similarity_backend = 'embedding'
+    matcher.embedder = EmbeddingBackend(None, model=HashingEncoder(), model_name='golden-hashing')
+    return {name: matcher.rank_candidates(run.resume_dir, path) for name, path in run.jd_paths.items()}
+
+
+def mode_cached_parse(run):
+    # Parse every resume once, then score it against all JDs
+    matcher = run.matcher
+    resumes = {path: matcher.parse_resume(path) for path in run.resume_paths}
+    rankings = {}
+    for name, jd_path in run.jd_paths.items():
+        jd_data = matcher.parse_job_description(jd_path)
+        rankings[name] = [matcher.score_candidate(data, jd_data, path) for path, data in resumes.items()]
+    return rankings
+
+
+def mode_top_k(run):
+    return {name: run.matcher.rank_candidates(run.resume_dir, path, top_k=TOP_K)
+            for name, path in run.jd_paths.items()}
+
+
+def mode_rerank(run):
+    from scoring import ScoreTable
+
+    return {name: ScoreTable.from_results(results).rerank(results, run.matcher.weights, run.matcher.thresholds)
+            for name, results in run.reference.items()}
+
+
+def rescore_python(run):
+    """Like-for-like baseline for rerank: re-score the stored components per candidate"""
+    matcher = run.matcher
+    rankings = {}
+    for name, results in run.reference.items():
+        rescored = []
+        for result in results:
+            overall = matcher.calculate_overall_score(
+                result['skill_match_percentage'], result['text_similarity'], result['experience_match']
+            )
+            rescored.append({**result, 'overall_score': overall,
+                             'recommendation': matcher.get_recommendation(overall)})
+        rankings[name] = sorted(rescored, key=lambda x: x['overall_score'], reverse=True)
+    return rankings
+
+
+def mode_profiled(run):
+    from profiling import DocumentProfiler
+
+    profiler = DocumentProfiler()
+    matcher = CandidateMatcher(weights=run.matcher.weights, thresholds=run.matcher.thresholds, profiler=profiler)
+    try:
+        return {name: matcher.rank_candidates(run.resume_dir, path) for name, path in run.jd_paths.items()}
+    finally:
+        profiler.close()
+
+
+# name -> (function, compared on the top TOP_K only, speedup baseline or None for the reference)
+MODES = {
+    'sequential': (mode_sequential, False, None),
+    'pool': (mode_pool, False, None),
+    'batch': (mode_batch, False, None),
+    'cached_parse': (mode_cached_parse, False, None),
+    'top_k': (mode_top_k, True, None),
+    'rerank': (mode_rerank, False, rescore_python),
+    'profiled': (mode_profiled, False, None),
+    'dedupe': (mode_dedupe, False, None),
+    'batch_dedupe': (mode_batch_dedupe, False, None),
+    'feature_store': (mode_feature_store, False, None),
+    'embedding': (mode_embedding, False, None),
+}
+
+# Modes checked against their own recorded rankings instead of the reference ones
+EXPECTED_RANKINGS = {'embedding': 'embedding_rankings'}
+
+
+def timed(function, *args, repeat=1):
+    """Run quietly `repeat` times; returns (last result, best seconds)"""
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function(*args)
+            best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every execution mode against the golden corpus")
+    parser.add_argument('--update', action='store_true',
+                        help="Re-record expected.json from the reference path instead of checking")
+    parser.add_argument('--mode', action='append', choices=list(MODES),
+                        help="Check only this mode (repeatable); the reference always runs")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="Allowed score difference")
+    parser.add_argument('--workers', type=int, default=2, help="Worker processes for pool and batch modes")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per mode (the best one is reported)")
+    args = parser.parse_args(argv)
+
+    corpus = load_json(CORPUS_FILE)
+    modes = ['sequential'] + [name for name in MODES if name != 'sequential' and (not args.mode or name in args.mode)]
+
+    print("=" * 80)
+    print(f" GOLDEN CORPUS: {len(corpus['resumes'])} resumes x {len(corpus['job_descriptions'])} JDs")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        resume_dir, jd_paths = materialize(corpus, work_dir)
+        matcher = CandidateMatcher()
+        run = Run(matcher, resume_dir, jd_paths, work_dir, args.workers)
+
+        (outputs, resumes, jds), _ = timed(reference_outputs, matcher, resume_dir, jd_paths)
+        run.reference, reference_seconds = timed(mode_sequential, run, repeat=args.repeat)
+        outputs['rankings'] = {name: ranking_summary(results) for name, results in run.reference.items()}
+
+        if args.update:
+            embedding, _ = timed(mode_embedding, run)
+            outputs['embedding_rankings'] = {name: ranking_summary(results) for name, results in embedding.items()}
+            with open(EXPECTED_FILE, 'w', encoding='utf-8') as f:
+                json.dump(outputs, f, indent=2, ensure_ascii=False)
+            print(f"💾 Expected outputs saved to: {EXPECTED_FILE}")
+            return 0
+
+        expected = load_json(EXPECTED_FILE)
+        failures = 0
+
+        print("\n Reference path:")
+        for section in ('parse_resume', 'skill_match', 'text_similarity'):
+            problems = compare(expected[section], outputs[section], args.tolerance, section)
+            failures += bool(problems)
+            print(f"   {'✅' if not problems else '❌'} {section}")
+            for problem in problems[:10]:
+                print(f"      {problem}")
+
+        problems = check_bounds(matcher, resumes, jds, args.tolerance)
+        failures += bool(problems)
+        print(f"   {'✅' if not problems else '❌'} score_upper_bound never below the score")
+        for problem in problems[:10]:
+            print(f"      {problem}")
+
+        print(f"\n {'Mode':<14} {'Seconds':>8} {'Speedup':>8}   Rankings")
+        print("-" * 80)
+        for name in modes:
+            function, top_only, baseline = MODES[name]
+            if name == 'sequential':
+                results, seconds = run.reference, reference_seconds
+            else:
+                results, seconds = timed(function, run, repeat=args.repeat)
+            baseline_seconds = reference_seconds
+            if baseline is not None:
+                _, baseline_seconds = timed(baseline, run, repeat=args.repeat)
+
+            problems = []
+            for jd_name, rows in expected[EXPECTED_RANKINGS.get(name, 'rankings')].items():
+                problems += compare_rankings(rows, ranking_summary(results.get(jd_name, [])), args.tolerance,
+                                             limit=TOP_K if top_only else None, where=jd_name)
+            failures += bool(problems)
+
+            status = "✅ identical" if not problems else f"❌ {len(problems)} difference(s)"
+            if baseline is not None:
+                status += f" (speedup vs {baseline.__name__})"
+            print(f" {name:<14} {seconds:>8.3f} {baseline_seconds / max(seconds, 1e-9):>7.2f}x   {status}")
+            for problem in problems[:10]:
+                print(f"      {problem}")
+
+    print("-" * 80)
+    if failures:
+        print(f"❌ {failures} check(s) disagree with {EXPECTED_FILE}")
+        return 1
+    print("✅ Every mode reproduces the golden rankings")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
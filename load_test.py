@@ -0,0 +1,196 @@
+"""
+Offline load test for interactive scoring.
+
+Simulates N concurrent recruiter sessions. Each session uploads M
+synthetic resumes plus a JD and scores them through the same path as the
+app's analyze flow: one shared CandidateMatcher (like the app's
+st.cache_resource) and match_candidate on temp files. Concurrency levels
+are run one after another; for each level the run reports throughput,
+per-document and per-session latency percentiles and peak RSS, and the
+saturation point is the first level where more sessions stop buying
+throughput.
+
+Usage:
+    python load_test.py --sessions 1 2 4 8 16 --resumes 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from matcher import CandidateMatcher
+from synthetic import synthetic_job_description, write_document, write_synthetic_pool
+
+SATURATION_GAIN = 1.10   # a level must add 10% throughput to count as scaling
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or 0 where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class RSSSampler:
+    """Background thread recording the peak RSS while active"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = current_rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+
+def build_sessions(work_dir, sessions, resumes_per_session, seed=0, shared_uploads=False, paragraphs=4):
+    """
+    Write one JD and M resumes per session
+    With shared_uploads every session uploads the same files (a hiring-event spike).
+    Returns:
+        List of (jd_path, [resume paths]) per session
+    """
+    plans = []
+    for session in range(sessions):
+        source = 0 if shared_uploads else session
+        session_dir = os.path.join(work_dir, f"session_{source:03d}")
+        jd_path = os.path.join(session_dir, "jd.txt")
+
+        if not os.path.exists(jd_path):
+            os.makedirs(session_dir, exist_ok=True)
+            session_seed = f"{seed}-{source}"
+            write_document(jd_path, synthetic_job_description(random.Random(session_seed)))
+            write_synthetic_pool(session_dir, resumes_per_session, seed=session_seed, paragraphs=paragraphs)
+
+        resume_paths = sorted(
+            os.path.join(session_dir, name) for name in os.listdir(session_dir) if name != "jd.txt"
+        )
+        plans.append((jd_path, resume_paths))
+    return plans
+
+
+def run_session(matcher, jd_path, resume_paths):
+    """One recruiter: score every upload in order; returns per-document latencies"""
+    latencies = []
+    for resume_path in resume_paths:
+        start = time.perf_counter()
+        matcher.match_candidate(resume_path, jd_path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_level(matcher, plans):
+    """Run all sessions concurrently and measure the level"""
+    session_times = [0.0] * len(plans)
+    latencies = []
+    lock = threading.Lock()
+
+    def session(i):
+        start = time.perf_counter()
+        session_latencies = run_session(matcher, *plans[i])
+        session_times[i] = time.perf_counter() - start
+        with lock:
+            latencies.extend(session_latencies)
+
+    with RSSSampler() as rss, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(plans)) as executor:
+            list(executor.map(session, range(len(plans))))
+        wall = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    sessions = np.array(session_times) * 1000
+    return {
+        'sessions': len(plans),
+        'documents': len(latencies),
+        'wall_seconds': round(wall, 3),
+        'throughput': round(len(latencies) / wall, 2),
+        'latency_ms': {f"p{p}": round(float(np.percentile(latencies, p)), 1) for p in (50, 90, 99)},
+        'session_ms': {f"p{p}": round(float(np.percentile(sessions, p)), 1) for p in (50, 95)},
+        'peak_rss_mb': round(rss.peak / (1024 * 1024), 1),
+    }
+
+
+def find_saturation(levels):
+    """Last level whose throughput still grew by SATURATION_GAIN over the level before"""
+    best = levels[0]
+    for previous, level in zip(levels, levels[1:]):
+        if level['throughput'] < previous['throughput'] * SATURATION_GAIN:
+            return previous
+        best = level
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test of concurrent match_candidate sessions")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to run, in order")
+    parser.add_argument('--resumes', type=int, default=10, help="Resumes uploaded per session")
+    parser.add_argument('--paragraphs', type=int, default=4, help="Experience paragraphs per synthetic resume")
+    parser.add_argument('--shared-uploads', action='store_true',
+                        help="Every session uploads the same files (exercises parse coalescing)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the measurements to this file")
+    args = parser.parse_args(argv)
+
+    print("=" * 100)
+    print(f" LOAD TEST: {args.resumes} resumes per session, levels {args.sessions}")
+    print("=" * 100)
+
+    matcher = CandidateMatcher()
+    levels = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Warm-up so imports and model loading are not charged to the first level
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_level(matcher, build_sessions(os.path.join(work_dir, "warmup"), 1, 2, seed=f"{args.seed}-warmup"))
+
+        for sessions in args.sessions:
+            plans = build_sessions(os.path.join(work_dir, f"level_{sessions}"), sessions, args.resumes,
+                                   seed=f"{args.seed}-{sessions}", shared_uploads=args.shared_uploads,
+                                   paragraphs=args.paragraphs)
+            level = run_level(matcher, plans)
+            levels.append(level)
+            print(f" {sessions:4d} sessions | {level['throughput']:7.1f} docs/s | "
+                  f"latency p50 {level['latency_ms']['p50']:7.1f} ms  p90 {level['latency_ms']['p90']:7.1f} ms  "
+                  f"p99 {level['latency_ms']['p99']:7.1f} ms | session p95 {level['session_ms']['p95'] / 1000:6.2f}s | "
+                  f"RSS {level['peak_rss_mb']:7.1f} MB")
+
+    saturation = find_saturation(levels)
+    print("-" * 100)
+    print(f" Saturation: ~{saturation['sessions']} concurrent sessions at {saturation['throughput']} docs/s "
+          f"(p99 {saturation['latency_ms']['p99']} ms)")
+    print(f" Parse coalescing: {matcher.inflight.executed} parses run, {matcher.inflight.shared} shared")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'levels': levels, 'saturation_sessions': saturation['sessions']}, f, indent=2)
+        print(f" Measurements saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,135 @@
+import os
+import tempfile
+from contextlib import nullcontext
+
+from Parser.fingerprint import bytes_hash, file_hash
 from Parser.resume_parser import ResumeParser
 from Parser.job_description_parser import JobDescriptionParser
+from singleflight import SingleFlight
 from text_vectorizer import TextVectorizer
+from scoring import RECOMMENDATIONS, band_of, normalize_weights, resolve_thresholds
 
 class CandidateMatcher:
-    def __init__(self):
+    def __init__(self, similarity_backend='tfidf', embedding_model=None, embedding_cache_dir=None,
+                 ocr_workers=0, ocr_cache_dir=None, weights=None, thresholds=None, profiler=None,
+                 coalesce_ttl=5.0):
+        """
+        Args:
+            similarity_backend: 'tfidf' (lexical) or 'embedding' (dense, needs embedding_model)
+            embedding_model: Local sentence-transformers model path for the dense backend
+            embedding_cache_dir: Optional directory for cached resume vectors
+            ocr_workers: Size of the OCR pool for scanned PDFs (0 disables OCR)
+            ocr_cache_dir: Optional directory for cached OCR results
+            weights: Overall score weights {'skills', 'similarity', 'experience'}
+            thresholds: Recommendation cutoffs {'strong', 'good', 'possible'}
+            profiler: Optional profiling.DocumentProfiler for per-document stage timings
+            coalesce_ttl: Seconds a parse result is shared with identical requests
+        """
+        self.weights = normalize_weights(weights)
+        self.thresholds = resolve_thresholds(thresholds)
+        self.profiler = profiler
+        
+        # Concurrent requests for the same content share one parse
+        self.inflight = SingleFlight(ttl=coalesce_ttl)
+        
         self.resume_parser = ResumeParser()
         self.jd_parser = JobDescriptionParser()
         self.vectorizer = TextVectorizer(method='tfidf')
+        
+        self.similarity_backend = similarity_backend
+        self.embedder = None
+        self.semantic_index = None
+        if similarity_backend == 'embedding':
+            from embeddings import EmbeddingBackend
+            self.embedder = EmbeddingBackend(embedding_model, cache_dir=embedding_cache_dir)
+        elif similarity_backend != 'tfidf':
+            raise ValueError(f"Unknown similarity backend: {similarity_backend}")
+        
+        self.ocr_queue = None
+        if ocr_workers:
+            from Parser.ocr import OCRQueue
+            self.ocr_queue = OCRQueue(max_workers=ocr_workers, cache_dir=ocr_cache_dir)
+        
+        # Bit position of every known skill, for the cheap prefilter stage;
+        # read-only after this point, since one matcher is shared across threads
+        self.skill_bits = {}
+        for skill in sorted(set(self.resume_parser.skills_database) | set(self.jd_parser.skills_database)):
+            self.skill_bits[skill.lower()] = len(self.skill_bits)
+    
+    def _document(self, resume_path):
+        """Profiling scope for one document (no-op unless a profiler is set)"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.document(resume_path)
+    
+    def _stage(self, name):
+        """Profiling scope for one pipeline stage (no-op unless a profiler is set)"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name)
+    
+    def parse_resume(self, resume_path):
+        """Parse a resume file; concurrent calls for the same content share one parse"""
+        extension = os.path.splitext(resume_path)[1].lower()
+        key = ('resume', file_hash(resume_path), extension)
+        return self.inflight.do(key, self.resume_parser.parse_resume, resume_path)
+    
+    def parse_resume_bytes(self, file_bytes, extension, content_hash=None):
+        """
+        Parse an uploaded resume's text layer from memory, coalesced by content hash
+        Image-only pages stay listed in 'ocr_pages'; queue them with submit_ocr.
+        """
+        content_hash = content_hash or bytes_hash(file_bytes)
+        key = ('resume', content_hash, extension.lower())
+        
+        def parse():
+            with tempfile.TemporaryDirectory() as temp_dir:
+                resume_path = os.path.join(temp_dir, f"{content_hash}{extension}")
+                with open(resume_path, 'wb') as f:
+                    f.write(file_bytes)
+                return self.resume_parser.parse_resume(resume_path)
+        
+        return self.inflight.do(key, parse)
+    
+    def submit_ocr(self, resume_data, resume_path=None, file_bytes=None):
+        """
+        Queue a parsed resume's image-only pages on the shared OCR pool
+        Args:
+            resume_path / file_bytes: The PDF on disk or in memory
+        Returns:
+            Future resolving to {page index: text} for finish_ocr, or None
+            when there are no scanned pages or no OCR pool
+        """
+        if not resume_data.get('ocr_pages') or self.ocr_queue is None:
+            return None
+        if file_bytes is not None:
+            return self.ocr_queue.submit_bytes(file_bytes, resume_data['ocr_pages'])
+        return self.ocr_queue.submit(resume_path, resume_data['ocr_pages'])
+    
+    def finish_ocr(self, resume_data, future):
+        """Wait for a submit_ocr job and re-parse the resume with its OCR text"""
+        with self._stage('ocr'):
+            return self.resume_parser.apply_ocr(resume_data, future.result())
+    
+    def complete_ocr(self, resume_path, resume_data):
+        """
+        Fill image-only pages with OCR text right away (single-resume callers)
+        Without an OCR pool the data comes back unchanged, still listing its 'ocr_pages'.
+        """
+        future = self.submit_ocr(resume_data, resume_path)
+        if future is None:
+            return resume_data
+        return self.finish_ocr(resume_data, future)
+    
+    def parse_job_description(self, jd_path):
+        """Parse a JD file; concurrent calls for the same content share one parse"""
+        with open(jd_path, 'r', encoding='utf-8') as f:
+            return self.parse_job_description_text(f.read())
+    
+    def parse_job_description_text(self, text):
+        """Parse JD text, coalesced by content hash"""
+        key = ('jd', bytes_hash(text.encode('utf-8')))
+        return self.inflight.do(key, self.jd_parser.parse_text, text)
     
     def calculate_skill_match_score(self, candidate_skills, required_skills):
         """Calculate percentage of required skills candidate has"""
@@ -35,9 +158,42 @@ class CandidateMatcher:
         }
     
     def calculate_text_similarity(self, resume_text, jd_text):
-        """Calculate cosine similarity using TextVectorizer"""
+        """
+        Calculate cosine similarity using the configured backend
+        Texts may be strings or AnalyzedDocuments (reused by the TF-IDF backend).
+        """
+        if self.embedder is not None:
+            return self.embedder.similarity(getattr(resume_text, 'text', resume_text),
+                                            getattr(jd_text, 'text', jd_text))
         return self.vectorizer.calculate_similarity(resume_text, jd_text)
     
+    def build_semantic_index(self, resume_texts, resume_ids, index_dir, n_probe=8):
+        """Embed the resume pool and persist an IVF index next to it"""
+        from embeddings import IVFFlatIndex
+        
+        if self.embedder is None:
+            raise ValueError("build_semantic_index needs similarity_backend='embedding'")
+        
+        vectors = self.embedder.embed(resume_texts)
+        self.semantic_index = IVFFlatIndex(n_probe=n_probe).build(vectors, resume_ids)
+        self.semantic_index.save(index_dir)
+        return self.semantic_index
+    
+    def load_semantic_index(self, index_dir):
+        """Load a persisted IVF index for find_similar_resumes"""
+        from embeddings import IVFFlatIndex
+        
+        self.semantic_index = IVFFlatIndex.load(index_dir)
+        return self.semantic_index
+    
+    def find_similar_resumes(self, jd_text, top_k=10):
+        """Top-K semantically closest resumes in the loaded index as (id, score) pairs"""
+        if self.embedder is None or self.semantic_index is None:
+            raise ValueError("Load or build a semantic index with the embedding backend first")
+        
+        query = self.embedder.embed([jd_text])[0]
+        return self.semantic_index.search(query, k=top_k)
+    
     def calculate_experience_match(self, candidate_exp, required_exp):
         """Score based on experience match"""
         if required_exp == 0:
@@ -52,11 +208,7 @@ class CandidateMatcher:
     
     def calculate_overall_score(self, skill_match, text_similarity, exp_match):
         """Weighted overall score"""
-        weights = {
-            'skills': 0.5,      # 50% weight
-            'similarity': 0.3,  # 30% weight
-            'experience': 0.2   # 20% weight
-        }
+        weights = self.weights
         
         overall = (
             skill_match * weights['skills'] +
@@ -66,35 +218,95 @@ class CandidateMatcher:
         
         return round(overall, 2)
     
+    def skill_bitset(self, skills, unknown=None):
+        """
+        Encode a skill list as an int bitset over self.skill_bits
+        Args:
+            skills: Skill names
+            unknown: Caller-owned {skill: bit} for skills outside self.skill_bits;
+                pass the same dict for every bitset that will be compared
+        """
+        if unknown is None:
+            unknown = {}
+        mask = 0
+        for skill in skills:
+            skill = skill.lower()
+            bit = self.skill_bits.get(skill)
+            if bit is None:
+                bit = unknown.setdefault(skill, len(self.skill_bits) + len(unknown))
+            mask |= 1 << bit
+        return mask
+    
+    def score_upper_bound(self, resume_data, jd_data):
+        """
+        Cheap upper bound on calculate_overall_score for a parsed resume
+        Uses skill bitset overlap and experience only; text similarity is
+        assumed to be a perfect 100 so the bound can never underestimate.
+        """
+        unknown = {}
+        required_mask = self.skill_bitset(jd_data['required_skills'], unknown)
+        required_count = bin(required_mask).count('1')
+        
+        if required_count:
+            matched = bin(self.skill_bitset(resume_data['skills'], unknown) & required_mask).count('1')
+            skill_percentage = round(matched / required_count * 100, 2)
+        else:
+            skill_percentage = 0.0
+        
+        exp_match = self.calculate_experience_match(
+            resume_data['experience_years'],
+            jd_data['required_experience']
+        )
+        
+        return self.calculate_overall_score(skill_percentage, 100.0, exp_match)
+    
     def get_recommendation(self, overall_score):
         """Get hiring recommendation based on score"""
-        if overall_score >= 75:
-            return "🟢 STRONG MATCH - Schedule Interview"
-        elif overall_score >= 60:
-            return "🟡 GOOD MATCH - Review Carefully"
-        elif overall_score >= 40:
-            return "🟠 POSSIBLE MATCH - Consider for Junior Role"
-        else:
-            return "🔴 WEAK MATCH - Not Recommended"
+        return RECOMMENDATIONS[band_of(overall_score, self.thresholds)]
     
-    def match_candidate(self, resume_path, jd_path):
-        """Match a single candidate to a job description"""
+    def match_candidate(self, resume_path, jd_path, min_score=None):
+        """
+        Match a single candidate to a job description
+        With min_score set, returns None without running text similarity
+        when the candidate's score upper bound cannot reach min_score.
+        """
         print(f"Processing: {resume_path}")
         
-        # Parse resume and JD
-        resume_data = self.resume_parser.parse_resume(resume_path)
-        jd_data = self.jd_parser.parse_job_description(jd_path)
-        
+        with self._document(resume_path):
+            # Parse resume and JD
+            with self._stage('parse'):
+                resume_data = self.parse_resume(resume_path)
+            with self._stage('parse_jd'):
+                jd_data = self.parse_job_description(jd_path)
+            
+            resume_data = self.complete_ocr(resume_path, resume_data)
+            
+            if min_score is not None:
+                with self._stage('screen'):
+                    bound = self.score_upper_bound(resume_data, jd_data)
+                if bound < min_score:
+                    return None
+            
+            return self.score_candidate(resume_data, jd_data, resume_path)
+    
+    def score_candidate(self, resume_data, jd_data, resume_path, text_similarity=None):
+        """
+        Score already parsed resume data against parsed JD data
+        A precomputed text_similarity (e.g. from a feature store) skips the similarity step.
+        """
         # Calculate individual scores
-        skill_match = self.calculate_skill_match_score(
-            resume_data['skills'], 
-            jd_data['required_skills']
-        )
+        with self._stage('skills'):
+            skill_match = self.calculate_skill_match_score(
+                resume_data['skills'], 
+                jd_data['required_skills']
+            )
         
-        text_similarity = self.calculate_text_similarity(
-            resume_data['raw_text'],
-            jd_data['raw_text']
-        )
+        if text_similarity is None:
+            with self._stage('similarity'):
+                text_similarity = self.calculate_text_similarity(
+                    resume_data.get('document', resume_data['raw_text']),
+                    jd_data.get('document', jd_data['raw_text'])
+                )
         
         exp_match = self.calculate_experience_match(
             resume_data['experience_years'],
@@ -124,30 +336,155 @@ class CandidateMatcher:
             'recommendation': recommendation
         }
     
-    def rank_candidates(self, resume_folder, jd_path):
-        """Rank all candidates for a job"""
+    def _parse_resumes(self, resume_paths, pool=None):
+        """Yield (resume_path, status, resume_data or error) in completion order"""
+        if pool is not None:
+            yield from pool.map(resume_paths)
+            return
+        
+        for resume_path in resume_paths:
+            print(f"Processing: {resume_path}")
+            # The document scope stays open while the caller scores this resume
+            with self._document(resume_path):
+                try:
+                    with self._stage('parse'):
+                        resume_data = self.resume_parser.parse_resume(resume_path)
+                except Exception as e:
+                    yield resume_path, 'error', str(e)
+                else:
+                    yield resume_path, 'ok', resume_data
+    
+    def rank_candidates(self, resume_folder, jd_path, dedupe=False, dedupe_threshold=0.9,
+                        top_k=None, min_score=None, pool=None):
+        """
+        Rank all candidates for a job
+        Args:
+            resume_folder: Folder with PDF/DOCX resumes
+            jd_path: Job description text file
+            dedupe: Score only one representative per group of near-duplicate resumes
+            dedupe_threshold: Estimated Jaccard similarity at which two resumes count as duplicates
+            top_k: Keep only the best top_k candidates; others are screened out early
+            min_score: Screen out candidates whose score bound is below this
+            pool: Optional workers.SupervisedPool that parses resumes in isolated processes
+                (with a pool, profiling covers only the scoring done in this process)
+        """
+        import heapq
         import os
         
         candidates = []
+        top_scores = []  # min-heap of the best top_k overall scores so far
+        screened_out = []
+        ocr_jobs = []
+        jd_data = self.parse_job_description(jd_path)
+        
+        deduplicator = None
+        representatives = {}
+        if dedupe:
+            from dedup import ResumeDeduplicator
+            deduplicator = ResumeDeduplicator(threshold=dedupe_threshold)
+        
+        def process(filename, resume_path, resume_data):
+            with self._document(resume_path):
+                score(filename, resume_path, resume_data)
+        
+        def score(filename, resume_path, resume_data):
+            signature = None
+            if deduplicator is not None:
+                # Only scored candidates are registered, so a duplicate always has a representative
+                with self._stage('dedupe'):
+                    signature = deduplicator.signature(resume_data['raw_text'])
+                    original = deduplicator.find_duplicate(signature=signature)
+                if original is not None:
+                    deduplicator.add(filename, signature=signature)
+                    representatives[original]['duplicates'].append(filename)
+                    print(f"⏭️  {filename}: near-duplicate of {original}, skipped")
+                    return
+            
+            # Cheap stage: skip similarity when the bound cannot make the cut
+            cutoff = min_score
+            if top_k and len(top_scores) == top_k:
+                cutoff = max(cutoff or 0, top_scores[0])
+            if cutoff is not None:
+                with self._stage('screen'):
+                    bound = self.score_upper_bound(resume_data, jd_data)
+                if bound < cutoff:
+                    screened_out.append(filename)
+                    print(f"⏭️  {filename}: at most {bound}%, screened out")
+                    return
+            
+            result = self.score_candidate(resume_data, jd_data, resume_path)
+            result['duplicates'] = []
+            representatives[filename] = result
+            if signature is not None:
+                deduplicator.add(filename, signature=signature)
+            candidates.append(result)
+            if top_k:
+                if len(top_scores) < top_k:
+                    heapq.heappush(top_scores, result['overall_score'])
+                else:
+                    heapq.heappushpop(top_scores, result['overall_score'])
+            print(f"✅ {filename}: {result['overall_score']}%")
         
         print("\n" + "=" * 80)
         print("🔄 PROCESSING CANDIDATES")
         print("=" * 80)
         
-        for filename in os.listdir(resume_folder):
-            if filename.endswith(('.pdf', '.docx')):
-                resume_path = os.path.join(resume_folder, filename)
-                try:
-                    result = self.match_candidate(resume_path, jd_path)
-                    candidates.append(result)
-                    print(f"✅ {filename}: {result['overall_score']}%")
-                except Exception as e:
-                    print(f"❌ Error processing {filename}: {e}")
+        resume_paths = [
+            os.path.join(resume_folder, filename)
+            for filename in os.listdir(resume_folder)
+            if filename.endswith(('.pdf', '.docx'))
+        ]
+        
+        if pool is not None:
+            # Largest documents first so no worker is left with a big file at the end
+            from scheduling import largest_first
+            resume_paths = largest_first(resume_paths)
+        
+        for resume_path, status, payload in self._parse_resumes(resume_paths, pool):
+            filename = os.path.basename(resume_path)
+            if status != 'ok':
+                print(f"❌ Error processing {filename} ({status}): {payload}")
+                continue
+            
+            try:
+                resume_data = payload
+                
+                # Scanned pages go to the OCR pool; keep going with text-layer files
+                future = self.submit_ocr(resume_data, resume_path)
+                if future is not None:
+                    ocr_jobs.append((filename, resume_path, resume_data, future))
+                    print(f"🕓 {filename}: {len(resume_data['ocr_pages'])} scanned page(s) queued for OCR")
+                    continue
+                
+                process(filename, resume_path, resume_data)
+            except Exception as e:
+                print(f"❌ Error processing {filename}: {e}")
+        
+        for filename, resume_path, resume_data, future in ocr_jobs:
+            try:
+                with self._document(resume_path):
+                    resume_data = self.finish_ocr(resume_data, future)
+                    process(filename, resume_path, resume_data)
+            except Exception as e:
+                print(f"❌ Error processing {filename} (OCR): {e}")
         
         # Sort by overall score (highest first)
         candidates.sort(key=lambda x: x['overall_score'], reverse=True)
+        skipped_duplicates = sum(len(c['duplicates']) for c in candidates)
+        if top_k:
+            candidates = candidates[:top_k]
         
         print(f"\n✅ Processed {len(candidates)} candidates")
+        if screened_out:
+            print(f"⏭️  Screened out {len(screened_out)} candidates before text similarity")
+        if deduplicator is not None:
+            print(f"⏭️  Skipped {skipped_duplicates} near-duplicate resumes")
+        if pool is not None:
+            from scheduling import print_utilization
+            print_utilization(pool)
+        if pool is not None and pool.poisoned:
+            print(f"☠️  {len(pool.poisoned)} poisoned file(s): "
+                  + ", ".join(os.path.basename(item) for item, _, _ in pool.poisoned))
         
         return candidates
 
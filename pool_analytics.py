@@ -0,0 +1,151 @@
+"""
+Pool-level analytics over a skill incidence matrix and score arrays.
+
+Results are scanned once to build a boolean (candidates x skills) matrix
+of which required skills each candidate has; every statistic after that
+(coverage, gaps, co-occurrence, score bands, percentiles) is a NumPy
+reduction, cheap enough to recompute on every Streamlit rerun.
+"""
+import numpy as np
+
+from scoring import BANDS, ScoreTable
+
+
+class PoolAnalytics:
+    """
+    Skill coverage and score distribution for a pool of scored candidates
+    """
+
+    def __init__(self, skills, has_skill, required, score_table, overall):
+        """
+        Args:
+            skills: Skill names, one per matrix column
+            has_skill: bool array (n_candidates, n_skills), skill matched
+            required: bool array (n_candidates, n_skills), skill required by the JD
+            score_table: ScoreTable with the component scores
+            overall: float array of overall scores as stored in the results
+        """
+        self.skills = list(skills)
+        self.has_skill = has_skill
+        self.required = required
+        self.score_table = score_table
+        self.overall = overall
+
+    @classmethod
+    def from_results(cls, results):
+        """Build the incidence matrix and score arrays in a single pass"""
+        skill_index = {}
+        rows, cols, matched = [], [], []
+
+        for i, result in enumerate(results):
+            for skills, has in ((result['matched_skills'], True), (result['missing_skills'], False)):
+                for skill in skills:
+                    rows.append(i)
+                    cols.append(skill_index.setdefault(skill, len(skill_index)))
+                    matched.append(has)
+
+        shape = (len(results), len(skill_index))
+        has_skill = np.zeros(shape, dtype=bool)
+        required = np.zeros(shape, dtype=bool)
+        if rows:
+            rows, cols = np.array(rows), np.array(cols)
+            required[rows, cols] = True
+            has_skill[rows, cols] = np.array(matched, dtype=bool)
+
+        overall = np.fromiter((r['overall_score'] for r in results), dtype=np.float64, count=len(results))
+        return cls(skill_index, has_skill, required, ScoreTable.from_results(results), overall)
+
+    def __len__(self):
+        return len(self.overall)
+
+    def skill_coverage(self):
+        """
+        Per-skill (skill, candidates with it, candidates it was required for, percent)
+        sorted by coverage, highest first
+        """
+        have = self.has_skill.sum(axis=0)
+        needed = self.required.sum(axis=0)
+        percent = np.divide(have * 100.0, needed, out=np.zeros(len(self.skills)), where=needed > 0)
+
+        order = np.argsort(-percent, kind='stable')
+        return [(self.skills[j], int(have[j]), int(needed[j]), round(float(percent[j]), 1)) for j in order]
+
+    def most_missing(self, n=10):
+        """The n most commonly missing skills as (skill, count), most missing first"""
+        missing = (self.required & ~self.has_skill).sum(axis=0)
+        order = np.argsort(-missing, kind='stable')
+        return [(self.skills[j], int(missing[j])) for j in order[:n] if missing[j] > 0]
+
+    def co_occurrence(self):
+        """(skills, matrix): matrix[a, b] = candidates having both skill a and skill b"""
+        has = self.has_skill.astype(np.int32)
+        return self.skills, has.T @ has
+
+    def overall_scores(self, weights=None):
+        """Stored overall scores, or re-weighted ones when weights are given"""
+        return self.overall if weights is None else self.score_table.overall(weights)
+
+    def band_counts(self, weights=None, thresholds=None):
+        """{band: count} for 'strong', 'good', 'possible' and 'weak'"""
+        bands = self.score_table.bands(self.overall_scores(weights), thresholds)
+        counts = np.bincount(bands, minlength=len(BANDS))
+        return {band: int(counts[i]) for i, band in enumerate(BANDS)}
+
+    def percentiles(self, q=(10, 25, 50, 75, 90), weights=None):
+        """{percentile: overall score}"""
+        overall = self.overall_scores(weights)
+        if not len(overall):
+            return {p: 0.0 for p in q}
+        return {p: round(float(v), 2) for p, v in zip(q, np.percentile(overall, q))}
+
+    def score_histogram(self, bins=10, weights=None):
+        """(counts, bin_edges) of overall scores over 0-100"""
+        return np.histogram(self.overall_scores(weights), bins=bins, range=(0, 100))
+
+    def summary(self, weights=None, thresholds=None):
+        """All pool statistics in one dict"""
+        counts, edges = self.score_histogram(weights=weights)
+        return {
+            'total': len(self),
+            'bands': self.band_counts(weights, thresholds),
+            'percentiles': self.percentiles(weights=weights),
+            'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+            'skill_coverage': self.skill_coverage(),
+            'most_missing': self.most_missing(),
+        }
+
+
+# Analyse a synthetic pool
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.RandomState(0)
+    required_skills = ['python', 'sql', 'docker', 'aws', 'nlp', 'git']
+
+    results = []
+    for i in range(100_000):
+        has = rng.rand(len(required_skills)) < [0.9, 0.6, 0.4, 0.3, 0.2, 0.7]
+        results.append({
+            'matched_skills': [s for s, h in zip(required_skills, has) if h],
+            'missing_skills': [s for s, h in zip(required_skills, has) if not h],
+            'skill_match_percentage': round(has.mean() * 100, 2),
+            'text_similarity': round(rng.uniform(0, 60), 2),
+            'experience_match': 100.0,
+            'overall_score': 0.0,
+        })
+    for result in results:
+        result['overall_score'] = round(
+            result['skill_match_percentage'] * 0.5 + result['text_similarity'] * 0.3 + 20, 2
+        )
+
+    start = time.perf_counter()
+    analytics = PoolAnalytics.from_results(results)
+    built = time.perf_counter()
+    summary = analytics.summary()
+    done = time.perf_counter()
+
+    print(f"Built incidence matrix for {len(analytics)} candidates in {(built - start) * 1000:.0f} ms")
+    print(f"Summary computed in {(done - built) * 1000:.1f} ms")
+    print("Bands:", summary['bands'])
+    print("Percentiles:", summary['percentiles'])
+    print("Most missing:", summary['most_missing'])
@@ -0,0 +1,252 @@
+"""
+Opt-in per-document profiling for the matching pipeline.
+
+While a document is being processed a background thread samples the
+processing thread's Python stack every few milliseconds. Each document
+gets a DocumentTrace with its wall time, per-stage breakdown (parse,
+similarity, ...), file hash and sampled stacks. DocumentProfiler keeps the
+N slowest traces and writes collapsed stacks ("a;b;c count" lines) that
+flamegraph.pl, speedscope and similar tools read directly.
+"""
+import heapq
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from Parser.fingerprint import file_hash
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def fold_stack(frame):
+    """Collapsed 'root;...;leaf' representation of a frame's stack"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class DocumentTrace:
+    """Timing, stage breakdown and sampled stacks for one document"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file_hash = None
+        self.elapsed = 0.0
+        self.stages = {}
+        self.stacks = Counter()
+
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'file_hash': self.file_hash,
+            'elapsed': round(self.elapsed, 6),
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'stacks': dict(self.stacks),
+        }
+
+    def merge(self, other):
+        """Fold another trace of the same document (e.g. a later stage) into this one"""
+        self.elapsed += other.elapsed
+        for name, seconds in other.stages.items():
+            self.add_stage(name, seconds)
+        self.stacks.update(other.stacks)
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        trace = cls(data['path'])
+        trace.file_hash = data.get('file_hash')
+        trace.elapsed = data['elapsed']
+        trace.stages = dict(data['stages'])
+        trace.stacks = Counter(data['stacks'])
+        return trace
+
+
+class DocumentProfiler:
+    """
+    Keeps the slowest documents and an aggregate flame profile
+    One profiler follows one processing thread at a time.
+    """
+
+    def __init__(self, keep_slowest=10, sample_interval=0.005):
+        """
+        Args:
+            keep_slowest: Number of slowest documents kept with their stacks
+            sample_interval: Seconds between stack samples (0 disables sampling)
+        """
+        self.keep_slowest = keep_slowest
+        self.sample_interval = sample_interval
+
+        self.documents = 0
+        self.total_time = 0.0
+        self.stage_totals = {}
+        self.stacks = Counter()   # aggregate over every document
+        self.last_trace = None
+
+        self._slowest = []        # min-heap of (elapsed, seq, trace)
+        self._seq = itertools.count()
+        self._current = None
+        self._thread_id = None
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    # Sampling ------------------------------------------------------------
+
+    def _sample_loop(self, stop):
+        while not stop.wait(self.sample_interval):
+            with self._lock:
+                trace, thread_id = self._current, self._thread_id
+            if trace is None:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = fold_stack(frame)
+            # Counted under the lock, and only while the trace is still open,
+            # so its stacks no longer change once document() has retired it
+            with self._lock:
+                if self._current is trace:
+                    trace.stacks[stack] += 1
+
+    def _ensure_sampler(self):
+        if self.sample_interval and self._sampler is None:
+            # A fresh stop event, so a profiler reused after close() samples again
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample_loop, args=(self._stop,),
+                                             name='doc-profiler', daemon=True)
+            self._sampler.start()
+
+    def close(self):
+        """Stop the sampling thread"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    # Recording -----------------------------------------------------------
+
+    @contextmanager
+    def document(self, path):
+        """
+        Profile everything done for one document inside this block
+        Re-entering for the document already being profiled is a no-op.
+        """
+        if self._current is not None and self._current.path == path:
+            yield self._current
+            return
+
+        trace = DocumentTrace(path)
+        self._ensure_sampler()
+        with self._lock:
+            self._current, self._thread_id = trace, threading.get_ident()
+
+        start = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            trace.elapsed = time.perf_counter() - start
+            with self._lock:
+                self._current = None
+            self.add(trace)
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute the time spent in this block to a named stage"""
+        trace = self._current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.add_stage(name, time.perf_counter() - start)
+
+    def add(self, trace):
+        """Record a finished trace (also used for traces shipped from workers)"""
+        self.documents += 1
+        self.total_time += trace.elapsed
+        for name, seconds in trace.stages.items():
+            self.stage_totals[name] = self.stage_totals.get(name, 0.0) + seconds
+        self.stacks.update(trace.stacks)
+        self.last_trace = trace
+
+        if not self.keep_slowest:
+            return
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, (trace.elapsed, next(self._seq), trace))
+        elif trace.elapsed > self._slowest[0][0]:
+            heapq.heappushpop(self._slowest, (trace.elapsed, next(self._seq), trace))
+        else:
+            return
+
+        if trace.file_hash is None and os.path.isfile(trace.path):
+            trace.file_hash = file_hash(trace.path)
+
+    def slowest(self):
+        """Kept traces, slowest first"""
+        return [trace for _, _, trace in sorted(self._slowest, key=lambda item: item[0], reverse=True)]
+
+    # Output --------------------------------------------------------------
+
+    @staticmethod
+    def write_collapsed(stacks, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+    def write(self, output_dir):
+        """
+        Write slowest.json, all.folded and one <rank>_<hash>.folded per slow document
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        slowest = self.slowest()
+
+        summary = {
+            'documents': self.documents,
+            'total_seconds': round(self.total_time, 6),
+            'stage_totals': {name: round(seconds, 6) for name, seconds in self.stage_totals.items()},
+            'slowest': [],
+        }
+        for rank, trace in enumerate(slowest, 1):
+            record = trace.to_dict()
+            stacks = record.pop('stacks')
+            record['folded_file'] = f"{rank:02d}_{(trace.file_hash or 'unknown')[:12]}.folded"
+            summary['slowest'].append(record)
+            self.write_collapsed(stacks, os.path.join(output_dir, record['folded_file']))
+
+        with open(os.path.join(output_dir, "slowest.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        self.write_collapsed(self.stacks, os.path.join(output_dir, "all.folded"))
+
+    def print_report(self):
+        print("\n" + "-" * 100)
+        print(" PROFILE - SLOWEST DOCUMENTS")
+        print("-" * 100)
+
+        if not self.documents:
+            print("\n No documents profiled")
+            return
+
+        print(f"\n {self.documents} documents, {self.total_time:.2f}s total, "
+              f"{self.total_time / self.documents * 1000:.1f} ms average")
+        for name, seconds in sorted(self.stage_totals.items(), key=lambda item: item[1], reverse=True):
+            print(f"   • {name}: {seconds:.2f}s ({seconds / self.total_time * 100:.0f}%)")
+
+        print()
+        for rank, trace in enumerate(self.slowest(), 1):
+            stages = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in trace.stages.items())
+            print(f" {rank:2d}. {os.path.basename(trace.path)} - {trace.elapsed * 1000:.0f} ms "
+                  f"[{(trace.file_hash or '?')[:12]}] {stages}")
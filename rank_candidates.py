@@ -1,6 +1,8 @@
-from matcher import CandidateMatcher
 import json
 import os
+import sys
+
+from pool_analytics import PoolAnalytics
 
 def display_rankings(candidates):
     """Display ranked candidates in a nice format"""
@@ -45,6 +47,10 @@ def display_rankings(candidates):
             if len(candidate['missing_skills']) > 5:
                 print(f"   ... and {len(candidate['missing_skills']) - 5} more")
         
+        # Near-duplicate submissions folded into this candidate
+        if candidate.get('duplicates'):
+            print(f"\n Also submitted as ({len(candidate['duplicates'])}): {', '.join(candidate['duplicates'])}")
+        
         # Recommendation
         print(f"\n {candidate['recommendation']}")
     
@@ -54,10 +60,8 @@ def display_rankings(candidates):
     print("-" * 100)
     
     total = len(candidates)
-    strong = len([c for c in candidates if c['overall_score'] >= 75])
-    good = len([c for c in candidates if 60 <= c['overall_score'] < 75])
-    possible = len([c for c in candidates if 40 <= c['overall_score'] < 60])
-    weak = len([c for c in candidates if c['overall_score'] < 40])
+    bands = PoolAnalytics.from_results(candidates).band_counts()
+    strong, good, possible, weak = bands['strong'], bands['good'], bands['possible'], bands['weak']
     
     print(f"\nTotal Candidates Analyzed: {total}")
     print(f"\nStrong Matches:   {strong:2d} ({strong/total*100:5.1f}%) - Schedule Interview")
@@ -92,10 +96,10 @@ def save_results_to_csv(candidates, output_file="ranking_results.csv"):
             'rank', 'candidate_name', 'overall_score', 
             'skill_match_percentage', 'text_similarity', 'experience_match',
             'email', 'phone', 'education', 'experience_years',
-            'matched_skills', 'missing_skills', 'recommendation'
+            'matched_skills', 'missing_skills', 'recommendation', 'duplicates'
         ]
         
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
         writer.writeheader()
         
         for i, candidate in enumerate(candidates, 1):
@@ -103,6 +107,7 @@ def save_results_to_csv(candidates, output_file="ranking_results.csv"):
             row['rank'] = i
             row['matched_skills'] = ', '.join(row['matched_skills'])
             row['missing_skills'] = ', '.join(row['missing_skills'])
+            row['duplicates'] = ', '.join(row.get('duplicates', []))
             writer.writerow(row)
     
     print(f" Results exported to CSV: {output_file}")
@@ -113,76 +118,164 @@ def analyze_skill_gaps(candidates):
     print(" SKILL GAP ANALYSIS")
     print("-" * 100)
     
-    all_missing = {}
-    
-    for candidate in candidates:
-        for skill in candidate['missing_skills']:
-            all_missing[skill] = all_missing.get(skill, 0) + 1
+    most_missing = PoolAnalytics.from_results(candidates).most_missing(10)
     
-    if all_missing:
-        sorted_missing = sorted(all_missing.items(), key=lambda x: x[1], reverse=True)
-        
+    if most_missing:
         print(f"\n Most Commonly Missing Skills:")
-        for skill, count in sorted_missing[:10]:
+        for skill, count in most_missing:
             percentage = (count / len(candidates)) * 100
             print(f"   • {skill}: {count}/{len(candidates)} candidates ({percentage:.0f}%)")
     else:
         print("\n All candidates have all required skills!")
 
-if __name__ == "__main__":
+def parse_args(argv=None):
+    """Command line options for batch ranking"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Rank resumes against one or more job descriptions with resumable checkpoints"
+    )
+    parser.add_argument('--resumes', nargs='+', default=[],
+                        help="Resume files, folders or glob patterns (default: data/resumes)")
+    parser.add_argument('--manifest',
+                        help="Text file listing resume files, folders or globs, one per line")
+    parser.add_argument('--jd', nargs='+', default=["data/job_descriptions/jd1.txt"],
+                        help="Job description .txt files")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Parsing/scoring worker processes")
+    parser.add_argument('--output-dir', default=".",
+                        help="Directory for results and checkpoint.jsonl")
+    parser.add_argument('--checkpoint-every', type=int, default=100,
+                        help="Flush the checkpoint after this many resumes")
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore an existing checkpoint and start over")
+    parser.add_argument('--timeout', type=float, default=60,
+                        help="Seconds allowed to process one resume")
+    parser.add_argument('--memory-mb', type=int, default=1024,
+                        help="Memory cap per worker in MB")
+    parser.add_argument('--dedupe-threshold', type=float, default=0.9,
+                        help="Near-duplicate similarity cutoff (0 disables deduplication)")
+    parser.add_argument('--feature-store', metavar='DIR',
+                        help="Score text similarity against a feature store of the parsed pool "
+                             "written to DIR (same scores, no per-resume TF-IDF fits)")
+    parser.add_argument('--ocr', action='store_true',
+                        help="OCR scanned PDF pages (needs pytesseract and pdf2image)")
+    parser.add_argument('--ocr-cache', metavar='DIR',
+                        help="Directory for cached OCR results")
+    parser.add_argument('--ocr-workers', type=int, default=2,
+                        help="Threads OCRing scanned pages alongside the scoring workers")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Skip the per-candidate ranking printout")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="Profile every resume; write the slowest ones and collapsed stacks to DIR")
+    parser.add_argument('--profile-keep', type=int, default=20,
+                        help="Number of slowest resumes kept by --profile")
+    
+    args = parser.parse_args(argv)
+    if not args.resumes and not args.manifest:
+        args.resumes = ["data/resumes"]
+    return args
+
+
+def main(argv=None):
+    from batch import expand_resume_sources, read_manifest, run_batch
+    
+    args = parse_args(argv)
+    
     print("-" * 100)
     print(" AI RESUME SCREENING & CANDIDATE RANKING SYSTEM")
     print("-" * 100)
     
-    # Initialize matcher
-    matcher = CandidateMatcher()
+    sources = list(args.resumes)
+    if args.manifest:
+        sources.extend(read_manifest(args.manifest))
     
-    # Configuration
-    RESUMES_FOLDER = "data/resumes"
-    JD_FILE = "data/job_descriptions/jd1.txt"
+    # Check inputs exist
+    missing_jds = [jd for jd in args.jd if not os.path.exists(jd)]
+    if missing_jds:
+        print(f"\n Error: Job description(s) not found: {', '.join(missing_jds)}")
+        return 1
     
-    # Check if folders exist
-    if not os.path.exists(RESUMES_FOLDER):
-        print(f"\n Error: Folder '{RESUMES_FOLDER}' not found!")
-        exit(1)
+    resume_paths = expand_resume_sources(sources)
+    if not resume_paths:
+        print(f"\n Error: No PDF/DOCX resumes found in {', '.join(sources)}")
+        return 1
     
-    if not os.path.exists(JD_FILE):
-        print(f"\n Error: Job description '{JD_FILE}' not found!")
-        exit(1)
-    
-    # Count resumes
-    resume_files = [f for f in os.listdir(RESUMES_FOLDER) if f.endswith(('.pdf', '.docx'))]
-    print(f"\n Found {len(resume_files)} resumes in '{RESUMES_FOLDER}'")
-    print(f" Using job description: '{JD_FILE}'")
+    print(f"\n Found {len(resume_paths)} resumes")
+    print(f" Using job description(s): {', '.join(args.jd)}")
     
     # Rank all candidates
     print("\n" + "-" * 100)
     print(" PROCESSING ALL CANDIDATES...")
     print("-" * 100)
     
-    candidates = matcher.rank_candidates(RESUMES_FOLDER, JD_FILE)
-    
-    # Display rankings
-    display_rankings(candidates)
+    profiler = None
+    if args.profile:
+        from profiling import DocumentProfiler
+        profiler = DocumentProfiler(keep_slowest=args.profile_keep)
     
-    # Skill gap analysis
-    analyze_skill_gaps(candidates)
+    try:
+        rankings = run_batch(
+            resume_paths, args.jd, args.output_dir,
+            workers=args.workers,
+            checkpoint_every=args.checkpoint_every,
+            timeout=args.timeout,
+            memory_limit_mb=args.memory_mb,
+            dedupe_threshold=args.dedupe_threshold or None,
+            restart=args.restart,
+            profiler=profiler,
+            ocr=args.ocr,
+            ocr_cache_dir=args.ocr_cache,
+            ocr_workers=args.ocr_workers,
+            feature_store_dir=args.feature_store
+        )
+    except ValueError as e:
+        print(f"\n Error: {e}")
+        return 1
     
-    # Save results
-    print("\n" + "-" * 100)
-    print(" SAVING RESULTS")
-    print("-" * 100)
+    output_files = []
+    for jd_name, candidates in rankings.items():
+        print("\n" + "=" * 100)
+        print(f" JOB DESCRIPTION: {jd_name}")
+        print("=" * 100)
+        
+        # Display rankings
+        if not args.quiet:
+            display_rankings(candidates)
+        
+        # Skill gap analysis
+        analyze_skill_gaps(candidates)
+        
+        # Save results
+        print("\n" + "-" * 100)
+        print(" SAVING RESULTS")
+        print("-" * 100)
+        
+        suffix = "" if len(rankings) == 1 else f"_{jd_name}"
+        json_file = os.path.join(args.output_dir, f"ranking_results{suffix}.json")
+        csv_file = os.path.join(args.output_dir, f"ranking_results{suffix}.csv")
+        save_results_to_json(candidates, json_file)
+        save_results_to_csv(candidates, csv_file)
+        output_files.extend([json_file, csv_file])
     
-    save_results_to_json(candidates)
-    save_results_to_csv(candidates)
+    if profiler is not None:
+        profiler.print_report()
+        profiler.write(args.profile)
+        output_files.append(os.path.join(args.profile, "slowest.json"))
+        output_files.append(os.path.join(args.profile, "all.folded"))
     
     print("\n" + "-" * 100)
     print(" ANALYSIS COMPLETE!")
     print("-" * 100)
     print("\n Check these files:")
-    print("   • ranking_results.json - Full detailed results")
-    print("   • ranking_results.csv - Spreadsheet format")
+    for output_file in output_files:
+        print(f"   • {output_file}")
     print("\n Next Steps:")
     print("   1. Review top candidates")
     print("   2. Schedule interviews with strong matches")
-    print("   3. Consider upskilling for common skill gaps")
\ No newline at end of file
+    print("   3. Consider upskilling for common skill gaps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
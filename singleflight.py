@@ -0,0 +1,122 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+The first caller for a key runs the function; callers arriving while it
+runs wait on the same Future and get the same result, or the same
+exception. A finished result stays shareable for `ttl` seconds, so a burst
+of identical uploads is parsed once. Errors are never kept: the next
+caller after a failure starts a fresh attempt.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class _Call:
+    __slots__ = ('future', 'started', 'finished')
+
+    def __init__(self, started):
+        self.future = Future()
+        self.started = started
+        self.finished = None
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of in-flight calls, with a short result expiry
+    Shared results are the same object for every caller - treat them as read-only.
+    """
+
+    def __init__(self, ttl=0.0, stale_after=None, clock=time.monotonic):
+        """
+        Args:
+            ttl: Seconds a finished result is still handed to new callers (0: in-flight only)
+            stale_after: New callers stop joining a call running longer than this
+            clock: Time source (monotonic seconds)
+        """
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.clock = clock
+
+        self.executed = 0   # calls that ran the function
+        self.shared = 0     # calls served by another caller's run
+
+        self._lock = threading.Lock()
+        self._calls = {}          # key -> _Call
+        self._expiry = deque()    # (expires at, key, call), in finishing order
+
+    def _usable(self, call, now):
+        if call.finished is None:
+            return self.stale_after is None or now - call.started < self.stale_after
+        return now < call.finished + self.ttl
+
+    def _prune(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            _, key, call = self._expiry.popleft()
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def _finish(self, key, call, keep):
+        with self._lock:
+            call.finished = self.clock()
+            if self._calls.get(key) is call:
+                if keep and self.ttl > 0:
+                    self._expiry.append((call.finished + self.ttl, key, call))
+                else:
+                    del self._calls[key]
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return fn(*args, **kwargs), sharing one run among concurrent callers with the same key"""
+        now = self.clock()
+        with self._lock:
+            self._prune(now)
+            call = self._calls.get(key)
+            leader = call is None or not self._usable(call, now)
+            if leader:
+                call = _Call(now)
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return call.future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, call, keep=False)
+            call.future.set_exception(e)
+            raise
+
+        self._finish(key, call, keep=True)
+        call.future.set_result(result)
+        return result
+
+    def forget(self, key):
+        """Drop a key so the next caller runs the function again"""
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+
+# Eight concurrent requests for the same slow parse
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    def slow_parse(name):
+        time.sleep(0.5)
+        return {'name': name}
+
+    flight = SingleFlight(ttl=5)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        start = time.perf_counter()
+        results = list(executor.map(lambda _: flight.do('resume.pdf', slow_parse, 'resume.pdf'), range(8)))
+        elapsed = time.perf_counter() - start
+
+    print(f"8 requests in {elapsed:.2f}s: {flight.executed} parse, {flight.shared} shared")
+    print(f"Same object for everyone: {all(result is results[0] for result in results)}")
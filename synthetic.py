@@ -0,0 +1,182 @@
+"""
+Synthetic resumes and job descriptions for offline load tests and checks.
+
+Documents are generated from a seed and written as real PDF / DOCX files
+with only the standard library (a minimal PDF with a Helvetica text layer,
+a minimal WordprocessingML zip), so they go through exactly the same
+parsing code as uploads do.
+"""
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SKILLS = [
+    'python', 'java', 'javascript', 'react', 'sql', 'mongodb',
+    'machine learning', 'deep learning', 'nlp', 'tensorflow',
+    'pytorch', 'docker', 'kubernetes', 'aws', 'git', 'agile',
+    'data analysis', 'pandas', 'numpy', 'scikit-learn'
+]
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Erin', 'Farah', 'Gopal', 'Hana', 'Ivan', 'Julia', 'Kenji', 'Lena']
+LAST_NAMES = ['Smith', 'Jones', 'Patel', 'Garcia', 'Chen', 'Okafor', 'Novak', 'Silva', 'Kim', 'Rossi']
+DEGREES = ['PhD in Computer Science', 'Masters in Data Science', 'MBA', 'Bachelor of Technology',
+           'B.S. in Mathematics', 'Diploma in Design']
+ROLES = ['Software Engineer', 'Data Scientist', 'ML Engineer', 'Backend Developer', 'Data Analyst']
+VERBS = ['Built', 'Designed', 'Maintained', 'Optimized', 'Migrated', 'Led', 'Automated', 'Scaled']
+OBJECTS = ['data pipelines', 'REST services', 'recommendation models', 'dashboards', 'batch jobs',
+           'search infrastructure', 'CI workflows', 'ETL processes', 'customer analytics']
+
+
+def synthetic_resume(rng, paragraphs=4):
+    """Resume text with contact details, sections and filler experience paragraphs"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    years = rng.randint(0, 15)
+    skills = rng.sample(SKILLS, rng.randint(2, 9))
+
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 {rng.randint(200, 999)} "
+        f"{rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {years} years of experience.",
+        "",
+        "Skills",
+        ", ".join(skills),
+        "",
+        "Work Experience",
+    ]
+    for _ in range(paragraphs):
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(LAST_NAMES)} Corp ({rng.randint(2005, 2023)} - present)")
+        lines.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} "
+                     f"and {rng.choice(skills)} for {rng.randint(2, 40)} teams.")
+    lines += ["", "Education", rng.choice(DEGREES)]
+    return "\n".join(lines)
+
+
+def synthetic_job_description(rng):
+    """JD text with required skills and a required experience sentence"""
+    skills = rng.sample(SKILLS, rng.randint(3, 7))
+    return "\n".join([
+        f"We are hiring a {rng.choice(ROLES)}.",
+        f"Requirements: {rng.randint(1, 8)}+ years of experience.",
+        "Must have: " + ", ".join(skills) + ".",
+        f"You will work on {rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}.",
+    ])
+
+
+def _pdf_escape(line):
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, text, lines_per_page=60):
+    """Write text as a minimal PDF with one Helvetica text layer line per input line"""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    number = 4
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(
+            f"({_pdf_escape(line)}) '" for line in page_lines
+        ) + " ET"
+        page_obj, content_obj = number, number + 1
+        number += 2
+        objects[page_obj] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                             f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>")
+        objects[content_obj] = f"<< /Length {len(content)} >>\nstream\n{content}\nendstream"
+        kids.append(f"{page_obj} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj in sorted(objects):
+        offsets[obj] = len(out)
+        out += f"{obj} 0 obj\n{objects[obj]}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {number}\n0000000000 65535 f \n".encode('ascii')
+    for obj in range(1, number):
+        out += f"{offsets[obj]:010d} 00000 n \n".encode('ascii')
+    out += f"trailer\n<< /Size {number} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('ascii')
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/>
+</Relationships>"""
+
+
+def write_docx(path, text, lines_per_page=45):
+    """Write text as a minimal .docx with one paragraph per input line"""
+    lines = text.split("\n")
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines
+    )
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{paragraphs}</w:body></w:document>')
+    app = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+           f'<Pages>{max(1, -(-len(lines) // lines_per_page))}</Pages></Properties>')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _RELS)
+        archive.writestr('word/document.xml', document)
+        archive.writestr('docProps/app.xml', app)
+
+
+def write_document(path, text):
+    """Write a .pdf, .docx or plain-text file depending on the extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        write_pdf(path, text)
+    elif extension == '.docx':
+        write_docx(path, text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def write_synthetic_pool(directory, count, seed=0, formats=('.pdf', '.docx'), paragraphs=4, prefix="resume"):
+    """Write count synthetic resumes into directory and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"{prefix}_{i:05d}{formats[i % len(formats)]}")
+        write_document(path, synthetic_resume(rng, paragraphs=paragraphs))
+        paths.append(path)
+    return paths
+
+
+# Write a small pool and parse it back
+if __name__ == "__main__":
+    import tempfile
+
+    from Parser.resume_parser import ResumeParser
+
+    parser = ResumeParser()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for path in write_synthetic_pool(temp_dir, 4):
+            data = parser.parse_resume(path)
+            print(f"   {os.path.basename(path)}: {data['email']} | {data['experience_years']} yrs | "
+                  f"{data['education']} | {sorted(data['skills'])}")
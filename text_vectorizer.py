@@ -1,8 +1,12 @@
+import numbers
+
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import re
-import string
+from scipy.sparse import csr_matrix
+
+from Parser.document import AnalyzedDocument, DocumentAnalyzer, as_document
 
 class TextVectorizer:
     """
@@ -14,14 +18,17 @@ class TextVectorizer:
         Initialize vectorizer
         Args:
             method: 'tfidf' or 'count' (TF-IDF is recommended)
+        Documents may be raw strings or Parser.document.AnalyzedDocument
+        objects; the latter keep their cleaned text and n-grams cached.
         """
         self.method = method
+        self._feature_names = None
+        self._feature_names_for = None
         
         if method == 'tfidf':
             self.vectorizer = TfidfVectorizer(
-                lowercase=True,
-                stop_words='english',
-                ngram_range=(1, 2),  # Unigrams and bigrams
+                # Lowercased, stop-word-filtered unigrams and bigrams from the shared document
+                analyzer=DocumentAnalyzer(ngram_range=(1, 2), stop_words='english'),
                 max_features=5000,    # Limit vocabulary size
                 min_df=1,             # Minimum document frequency
                 max_df=0.8,           # Maximum document frequency
@@ -29,9 +36,7 @@ class TextVectorizer:
             )
         else:
             self.vectorizer = CountVectorizer(
-                lowercase=True,
-                stop_words='english',
-                ngram_range=(1, 2),
+                analyzer=DocumentAnalyzer(ngram_range=(1, 2), stop_words='english'),
                 max_features=5000
             )
     
@@ -42,28 +47,8 @@ class TextVectorizer:
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove phone numbers
-        text = re.sub(r'\+?\d[\d\s\-\(\)]+\d', '', text)
-        
-        # Remove special characters but keep spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove numbers (optional - you might want to keep them)
-        # text = re.sub(r'\d+', '', text)
-        
-        return text
+        # Lowercase, drop URLs / emails / phone numbers / punctuation (cached on the document)
+        return as_document(text).cleaned
     
     def vectorize_documents(self, documents):
         """
@@ -73,11 +58,11 @@ class TextVectorizer:
         Returns:
             Sparse matrix of TF-IDF features
         """
-        # Preprocess all documents
-        processed_docs = [self.preprocess_text(doc) for doc in documents]
+        # Analyze every document once (reused if already analyzed)
+        analyzed_docs = [as_document(doc) for doc in documents]
         
         # Fit and transform
-        vectors = self.vectorizer.fit_transform(processed_docs)
+        vectors = self.vectorizer.fit_transform(analyzed_docs)
         
         return vectors
     
@@ -85,20 +70,16 @@ class TextVectorizer:
         """
         Transform a single document using fitted vectorizer
         """
-        processed_doc = self.preprocess_text(document)
-        return self.vectorizer.transform([processed_doc])
+        return self.vectorizer.transform([as_document(document)])
     
     def calculate_similarity(self, text1, text2):
         """
         Calculate cosine similarity between two texts
         Returns: Similarity score (0-100)
         """
-        # Preprocess texts
-        processed_text1 = self.preprocess_text(text1)
-        processed_text2 = self.preprocess_text(text2)
-        
-        # Vectorize
-        vectors = self.vectorizer.fit_transform([processed_text1, processed_text2])
+        # Vectorize with a private copy so shared instances stay thread-safe;
+        # an AnalyzedDocument (e.g. the JD) is only tokenized once across calls
+        vectors = clone(self.vectorizer).fit_transform([as_document(text1), as_document(text2)])
         
         # Calculate cosine similarity
         similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
@@ -106,26 +87,83 @@ class TextVectorizer:
         # Convert to percentage
         return round(similarity * 100, 2)
     
-    def get_top_features(self, text, top_n=10):
+    def is_fitted(self):
+        """True once vectorize_documents (or a fit) has learned a vocabulary"""
+        return hasattr(self.vectorizer, 'vocabulary_')
+    
+    def feature_names(self):
+        """Vocabulary terms by column index, cached until the next fit"""
+        vocabulary = self.vectorizer.vocabulary_
+        if self._feature_names_for is not vocabulary:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+            self._feature_names_for = vocabulary
+        return self._feature_names
+    
+    def explain_rows(self, vectors, top_n=10):
         """
-        Get the most important features (keywords) from text
+        Top-N (keyword, weight) pairs for every row of a fitted sparse matrix
+        Reads each CSR row's non-zeros directly - no densifying, no refit.
         """
-        processed_text = self.preprocess_text(text)
+        vectors = vectors.tocsr()
+        feature_names = self.feature_names()
+        explanations = []
         
-        # Transform text
-        vector = self.vectorizer.fit_transform([processed_text])
+        for row in range(vectors.shape[0]):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            data = vectors.data[start:end]
+            indices = vectors.indices[start:end]
+            
+            if len(data) > top_n:
+                top = np.argpartition(-data, top_n - 1)[:top_n]
+            else:
+                top = np.arange(len(data))
+            top = top[np.argsort(-data[top], kind='stable')]
+            
+            explanations.append([(feature_names[indices[i]], float(data[i])) for i in top])
         
-        # Get feature names
-        feature_names = self.vectorizer.get_feature_names_out()
+        return explanations
+    
+    def explain_documents(self, texts, top_n=10):
+        """
+        Top-N keywords for a batch of documents using the already fitted model
+        """
+        if not self.is_fitted():
+            raise ValueError("Fit the vectorizer first (vectorize_documents or explain_pool)")
         
-        # Get TF-IDF scores
-        tfidf_scores = vector.toarray()[0]
+        analyzed_docs = [as_document(text) for text in texts]
+        return self.explain_rows(self.vectorizer.transform(analyzed_docs), top_n=top_n)
+    
+    def explain_pool(self, documents, top_n=10):
+        """
+        Fit once on a pool of documents and return top-N keywords per document
+        """
+        try:
+            vectors = self.vectorize_documents(documents)
+        except ValueError:
+            if self.vectorizer.max_df == 1.0:
+                raise
+            # Pools too small for max_df pruning (e.g. a single resume) are explained
+            # by a private copy, so the shared vectorizer keeps its settings
+            return self.without_max_df().explain_pool(documents, top_n=top_n)
         
-        # Get top N features
-        top_indices = tfidf_scores.argsort()[-top_n:][::-1]
-        top_features = [(feature_names[i], tfidf_scores[i]) for i in top_indices]
+        return self.explain_rows(vectors, top_n=top_n)
+    
+    def without_max_df(self):
+        """Unfitted copy of this vectorizer with max_df pruning turned off"""
+        copy = TextVectorizer(method=self.method)
+        copy.vectorizer = clone(self.vectorizer).set_params(max_df=1.0)
+        return copy
+    
+    def get_top_features(self, text, top_n=10):
+        """
+        Get the most important features (keywords) from text
+        Uses the fitted corpus model when there is one; otherwise fits a
+        private copy on this text so the shared fitted state is untouched.
+        """
+        if self.is_fitted():
+            return self.explain_documents([text], top_n=top_n)[0]
         
-        return top_features
+        return self.without_max_df().explain_pool([text], top_n=top_n)[0]
     
     def batch_similarity(self, resume_texts, job_description):
         """
@@ -136,12 +174,8 @@ class TextVectorizer:
         Returns:
             List of similarity scores
         """
-        # Preprocess all texts
-        processed_resumes = [self.preprocess_text(text) for text in resume_texts]
-        processed_jd = self.preprocess_text(job_description)
-        
         # Combine all documents
-        all_docs = processed_resumes + [processed_jd]
+        all_docs = [as_document(text) for text in resume_texts] + [as_document(job_description)]
         
         # Vectorize
         vectors = self.vectorizer.fit_transform(all_docs)
@@ -157,6 +191,152 @@ class TextVectorizer:
         
         return similarities
 
+    def build_feature_store(self, documents, store_dir, doc_ids=None, pairwise=False):
+        """
+        Fit on the resume pool and write it to an on-disk CSR feature store
+        Args:
+            documents: List of resume texts
+            store_dir: Directory for the data/indices/indptr .npy files
+            doc_ids: Optional id per document (defaults to its position)
+            pairwise: Store raw term counts of already cleaned texts for
+                pairwise_store_similarity instead of pool-fitted TF-IDF rows
+        Returns:
+            Number of documents written
+        """
+        from feature_store import write_feature_store
+
+        if doc_ids is None:
+            doc_ids = range(len(documents))
+        doc_ids = list(doc_ids)
+        if len(doc_ids) != len(documents):
+            raise ValueError("doc_ids must have one entry per document")
+
+        if pairwise:
+            # Unpruned vocabulary; each pair's pruning and weighting is applied at query time.
+            # Plain strings reach the analyzer as cleaned text, exactly as in calculate_similarity
+            counter = CountVectorizer(analyzer=self.vectorizer.analyzer)
+            counts = counter.fit_transform(list(documents))
+            write_feature_store(store_dir, counts, doc_ids, counter, self.method, counts=True)
+            return len(documents)
+
+        vectorizer = self
+        try:
+            vectors = self.vectorize_documents(documents)
+        except ValueError:
+            if self.vectorizer.max_df == 1.0:
+                raise
+            # Pools too small for max_df pruning (e.g. a single resume)
+            vectorizer = self.without_max_df()
+            vectors = vectorizer.vectorize_documents(documents)
+        write_feature_store(store_dir, vectors, doc_ids, vectorizer.vectorizer, self.method)
+
+        return len(documents)
+
+    def pairwise_store_similarity(self, store, job_description, chunk_rows=100_000):
+        """
+        calculate_similarity of a JD against every row of a pairwise feature store
+        Each row's two-document fit is rebuilt from its term counts, so no
+        vectorizer is refitted. Rows whose pair would keep no terms or more
+        than max_features terms (where a real fit raises or truncates the
+        vocabulary) are NaN; score those with calculate_similarity.
+        Args:
+            store: FeatureStore built with build_feature_store(..., pairwise=True)
+            job_description: JD text or AnalyzedDocument
+        Returns:
+            float64 array of similarity percentages (0-100) or NaN, one per row
+        """
+        if not store.meta.get('counts'):
+            raise ValueError("pairwise_store_similarity needs a store built with pairwise=True")
+
+        params = self.vectorizer.get_params()
+        sublinear = params.get('sublinear_tf', False)
+        max_features = params['max_features']
+
+        # Document-frequency limits of a two-document fit, as sklearn computes them
+        def doc_count(value):
+            return value if isinstance(value, numbers.Integral) else value * 2
+        min_count, max_count = doc_count(params['min_df']), doc_count(params['max_df'])
+        keep_single = float(min_count <= 1 <= max_count)   # terms in one of the two documents
+        keep_shared = float(min_count <= 2 <= max_count)   # terms in both
+
+        # Terms in both documents get idf 1; terms in one get this one
+        single_idf = 1.0
+        if params.get('use_idf', False):
+            single_idf = np.log(3 / 2) + 1 if params.get('smooth_idf', True) else np.log(2) + 1
+        single_weight = keep_single * single_idf ** 2
+
+        def weight(counts):
+            counts = np.asarray(counts, dtype=np.float64)
+            return 1 + np.log(counts) if sublinear else counts
+
+        # The JD's own terms, including those no stored document has
+        jd_counts = {}
+        for term in self.vectorizer.analyzer(as_document(job_description)):
+            jd_counts[term] = jd_counts.get(term, 0) + 1
+        jd_weights = weight(list(jd_counts.values())) if jd_counts else np.zeros(0)
+        jd_total = float(np.sum(jd_weights ** 2))
+
+        vocabulary = store.vectorizer.vocabulary_
+        in_store = [(vocabulary[term], w) for term, w in zip(jd_counts, jd_weights) if term in vocabulary]
+        columns = np.array([column for column, _ in in_store], dtype=np.int64)
+        values = np.array([w for _, w in in_store], dtype=np.float64)
+
+        def column(data):
+            zeros = np.zeros(len(columns), dtype=np.int64)
+            return csr_matrix((data, (columns, zeros)), shape=(store.meta['n_features'], 1))
+        jd_vector, jd_squares, jd_terms = column(values), column(values ** 2), column(np.ones(len(columns)))
+
+        n_docs = len(store)
+        scores = np.empty(n_docs, dtype=np.float64)
+        for start in range(0, n_docs, chunk_rows):
+            stop = min(start + chunk_rows, n_docs)
+            rows = store.rows(start, stop).astype(np.float64)
+            rows.data = weight(rows.data)
+            present = rows.copy()
+            present.data = np.ones_like(present.data)
+
+            dot = np.asarray((rows @ jd_vector).todense()).ravel()
+            shared_terms = np.asarray((present @ jd_terms).todense()).ravel()
+            resume_shared = np.asarray((rows.multiply(rows) @ jd_terms).todense()).ravel()
+            jd_shared = np.asarray((present @ jd_squares).todense()).ravel()
+            resume_total = np.asarray(rows.multiply(rows).sum(axis=1)).ravel()
+            resume_terms = np.diff(rows.indptr)
+
+            resume_norm = single_weight * (resume_total - resume_shared) + keep_shared * resume_shared
+            jd_norm = single_weight * (jd_total - jd_shared) + keep_shared * jd_shared
+            denominator = np.sqrt(resume_norm) * np.sqrt(jd_norm)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                similarity = np.where(denominator > 0, keep_shared * dot / denominator, 0.0)
+
+            kept = keep_single * (resume_terms + len(jd_counts) - 2 * shared_terms) + keep_shared * shared_terms
+            unmatched = kept == 0
+            if max_features is not None:
+                unmatched |= kept > max_features
+            if max_count < min_count:
+                unmatched[:] = True
+            similarity[unmatched] = np.nan
+            scores[start:stop] = similarity
+
+        return np.round(scores * 100, 2)
+
+    def score_feature_store(self, store, job_description, top_k=None):
+        """
+        Score a JD against a memory-mapped feature store
+        Args:
+            store: FeatureStore instance or path to a store directory
+            job_description: Single JD text
+            top_k: If given, return only the best top_k (doc_id, score) pairs
+        Returns:
+            List of (doc_id, similarity) pairs, best first
+        """
+        from feature_store import FeatureStore
+
+        if isinstance(store, (str, bytes)) or hasattr(store, '__fspath__'):
+            store = FeatureStore(store)
+
+        processed_jd = self.preprocess_text(job_description)
+        return store.top_k(processed_jd, k=top_k if top_k is not None else len(store))
+
 
 # Test the vectorizer
 if __name__ == "__main__":
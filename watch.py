@@ -0,0 +1,305 @@
+"""
+Watch a drop directory and keep live rankings up to date.
+
+New or modified PDF/DOCX files are picked up with inotify when the optional
+inotify_simple package is available (Linux), or by polling the directory
+otherwise. A file is processed once it has been quiet for the debounce
+period, files are parsed in micro-batches, and each active JD keeps a
+sorted live ranking that is updated incrementally. Files removed from the
+directory are dropped from the rankings.
+"""
+import bisect
+import json
+import os
+import sys
+import time
+
+from matcher import CandidateMatcher
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+
+class DirectoryWatcher:
+    """
+    Reports resume files whose last change is older than `debounce` seconds,
+    and resume files that were deleted or moved away
+    """
+
+    def __init__(self, directory, debounce=2.0, poll_interval=1.0, include_existing=True):
+        self.directory = directory
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._changed = {}   # file name -> monotonic time of last change
+        self._deleted = set()
+        self._seen = {}      # file name -> (mtime_ns, size), polling mode only
+        self._inotify = None
+
+        if INotify is not None:
+            self._inotify = INotify()
+            self._inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.MODIFY |
+                                    flags.DELETE | flags.MOVED_FROM)
+
+        now = time.monotonic()
+        for name, stamp in self._scan().items():
+            self._seen[name] = stamp
+            if include_existing:
+                self._changed[name] = now - debounce
+
+    @property
+    def mode(self):
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _scan(self):
+        stamps = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(RESUME_EXTENSIONS):
+                    stat = entry.stat()
+                    stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _changed_now(self, name):
+        self._changed[name] = time.monotonic()
+        self._deleted.discard(name)
+
+    def _removed(self, name):
+        self._changed.pop(name, None)
+        self._deleted.add(name)
+
+    def _wait_time(self, timeout):
+        """Never wait past the moment the next pending change settles"""
+        if not self._changed:
+            return timeout
+        settles = min(self._changed.values()) + self.debounce - time.monotonic()
+        return max(0.0, min(timeout, settles))
+
+    def _collect_changes(self, timeout):
+        timeout = self._wait_time(timeout)
+        if self._inotify is not None:
+            for event in self._inotify.read(timeout=int(timeout * 1000)):
+                if event.name.lower().endswith(RESUME_EXTENSIONS):
+                    if event.mask & (flags.DELETE | flags.MOVED_FROM):
+                        self._removed(event.name)
+                    else:
+                        self._changed_now(event.name)
+            return
+
+        if timeout > 0:
+            time.sleep(timeout)
+        stamps = self._scan()
+        for name, stamp in stamps.items():
+            if self._seen.get(name) != stamp:
+                self._seen[name] = stamp
+                self._changed_now(name)
+        for name in set(self._seen) - set(stamps):
+            del self._seen[name]
+            self._removed(name)
+
+    def poll(self, timeout=None):
+        """
+        Wait up to timeout (default poll_interval) for changes; returns at once
+        when a pending change has already settled
+        Returns:
+            (sorted file names that have settled since they last changed,
+             sorted file names deleted since the last poll)
+        """
+        self._collect_changes(self.poll_interval if timeout is None else timeout)
+
+        now = time.monotonic()
+        ready = sorted(name for name, changed in self._changed.items() if now - changed >= self.debounce)
+        for name in ready:
+            del self._changed[name]
+            if not os.path.exists(os.path.join(self.directory, name)):
+                self._deleted.add(name)
+
+        deleted = sorted(self._deleted)
+        self._deleted.clear()
+        return [name for name in ready if name not in deleted], deleted
+
+
+class LiveRanking:
+    """
+    Candidates for one JD kept sorted by overall score, updated in place
+    """
+
+    def __init__(self, jd_name, jd_data):
+        self.jd_name = jd_name
+        self.jd_data = jd_data
+        self._keys = []      # sorted (-overall_score, candidate_name)
+        self._results = {}   # candidate_name -> result
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, result):
+        """Insert or replace a candidate; returns its 1-based rank"""
+        name = result['candidate_name']
+        self.remove(name)
+
+        key = (-result['overall_score'], name)
+        position = bisect.bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._results[name] = result
+        return position + 1
+
+    def remove(self, name):
+        """Drop a candidate; returns False if it was not ranked"""
+        if name not in self._results:
+            return False
+        old_key = (-self._results.pop(name)['overall_score'], name)
+        del self._keys[bisect.bisect_left(self._keys, old_key)]
+        return True
+
+    def top(self, n=10):
+        return [self._results[name] for _, name in self._keys[:n]]
+
+    def ranked(self):
+        return [self._results[name] for _, name in self._keys]
+
+
+def watch(drop_dir, jd_paths, output_dir=None, batch_size=16, debounce=2.0,
+          poll_interval=1.0, include_existing=True, top_n=5, max_batches=None, ocr_workers=0):
+    """
+    Score resumes as they land in drop_dir and keep a live ranking per JD
+    Args:
+        drop_dir: Directory to watch
+        jd_paths: Job description files to rank against
+        output_dir: If set, live rankings are rewritten here after every batch
+        batch_size: Maximum resumes parsed per micro-batch
+        debounce: Seconds a file must be unchanged before it is processed
+        poll_interval: Seconds to wait for filesystem events per cycle
+        include_existing: Also score files already in drop_dir at start-up
+        top_n: Candidates shown per JD after each batch
+        max_batches: Stop after this many batches (None runs until interrupted)
+        ocr_workers: Size of the OCR pool for scanned PDFs (0 skips scanned pages with a warning)
+    """
+    matcher = CandidateMatcher(ocr_workers=ocr_workers)
+    rankings = {}
+    for jd_path in jd_paths:
+        jd_name = os.path.splitext(os.path.basename(jd_path))[0]
+        rankings[jd_name] = LiveRanking(jd_name, matcher.jd_parser.parse_job_description(jd_path))
+
+    watcher = DirectoryWatcher(drop_dir, debounce=debounce, poll_interval=poll_interval,
+                               include_existing=include_existing)
+    print(f"👀 Watching '{drop_dir}' ({watcher.mode}) for {', '.join(rankings)}")
+
+    def score(filename, resume_path, resume_data):
+        for ranking in rankings.values():
+            result = matcher.score_candidate(resume_data, ranking.jd_data, resume_path)
+            rank = ranking.update(result)
+            print(f"✅ {filename} → {ranking.jd_name}: {result['overall_score']}% (rank #{rank})")
+
+    backlog = []
+    ocr_jobs = {}   # file name -> (resume path, text-layer data, OCR future)
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            # Queued files are scored right away; only an empty backlog waits for events
+            ready, deleted = watcher.poll(timeout=0 if backlog else None)
+            if deleted:
+                backlog = [name for name in backlog if name not in deleted]
+                for name in deleted:
+                    ocr_jobs.pop(name, None)
+                for ranking in rankings.values():
+                    removed = [name for name in deleted if ranking.remove(name)]
+                    for name in removed:
+                        print(f"🗑️  {name} removed from {ranking.jd_name}")
+                    if removed and output_dir:
+                        save_live_ranking(ranking, output_dir)
+            backlog.extend(name for name in ready if name not in backlog)
+            ocr_done = [name for name, (_, _, future) in ocr_jobs.items() if future.done()]
+            if not backlog and not ocr_done:
+                continue
+
+            batch, backlog = backlog[:batch_size], backlog[batch_size:]
+            started = time.perf_counter()
+
+            for filename in batch:
+                resume_path = os.path.join(drop_dir, filename)
+                ocr_jobs.pop(filename, None)   # superseded by this newer version of the file
+                try:
+                    resume_data = matcher.resume_parser.parse_resume(resume_path)
+                    # Scanned pages go to the OCR pool; the batch goes on with text-layer files
+                    future = matcher.submit_ocr(resume_data, resume_path)
+                    if future is not None:
+                        ocr_jobs[filename] = (resume_path, resume_data, future)
+                        print(f"🕓 {filename}: {len(resume_data['ocr_pages'])} scanned page(s) queued for OCR")
+                        continue
+                    if resume_data.get('ocr_pages'):
+                        print(f"⚠️  {filename}: {len(resume_data['ocr_pages'])} scanned page(s) skipped; "
+                              "run with --ocr to read them")
+                    score(filename, resume_path, resume_data)
+                except Exception as e:
+                    print(f"❌ Error processing {filename}: {e}")
+
+            # OCR results that came in since the last batch
+            for filename in ocr_done:
+                if filename not in ocr_jobs:
+                    continue
+                resume_path, resume_data, future = ocr_jobs.pop(filename)
+                try:
+                    score(filename, resume_path, matcher.finish_ocr(resume_data, future))
+                except Exception as e:
+                    print(f"❌ Error processing {filename} (OCR): {e}")
+
+            batches += 1
+            elapsed = time.perf_counter() - started
+            print(f"⚡ Batch of {len(batch)} scored in {elapsed:.2f}s"
+                  + (f" (+{len(ocr_done)} OCRed)" if ocr_done else ""))
+
+            for ranking in rankings.values():
+                leaders = ", ".join(f"{r['candidate_name']} ({r['overall_score']}%)" for r in ranking.top(top_n))
+                print(f"   🏆 {ranking.jd_name} [{len(ranking)}]: {leaders}")
+                if output_dir:
+                    save_live_ranking(ranking, output_dir)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+    return rankings
+
+
+def save_live_ranking(ranking, output_dir):
+    """Atomically rewrite <output_dir>/live_<jd>.json"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"live_{ranking.jd_name}.json")
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(ranking.ranked(), f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Continuously rank resumes dropped into a folder")
+    parser.add_argument('drop_dir', help="Folder new resumes are copied into")
+    parser.add_argument('--jd', nargs='+', default=["data/job_descriptions/jd1.txt"],
+                        help="Job description .txt files to rank against")
+    parser.add_argument('--output-dir', help="Write live_<jd>.json rankings here after each batch")
+    parser.add_argument('--batch-size', type=int, default=16, help="Resumes per micro-batch")
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help="Seconds a file must be unchanged before scoring")
+    parser.add_argument('--skip-existing', action='store_true',
+                        help="Only score files that arrive after start-up")
+    parser.add_argument('--ocr', action='store_true',
+                        help="OCR scanned PDF pages (needs pytesseract and pdf2image)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.drop_dir):
+        print(f"\n Error: Folder '{args.drop_dir}' not found!")
+        return 1
+
+    watch(args.drop_dir, args.jd, output_dir=args.output_dir, batch_size=args.batch_size,
+          debounce=args.debounce, include_existing=not args.skip_existing,
+          ocr_workers=2 if args.ocr else 0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Supervised worker pool for parsing untrusted resume files.
+
+Every worker is a separate process that parses one document at a time.
+The supervisor enforces a wall-clock timeout per document, caps each
+worker's memory with resource.setrlimit, recycles workers after a fixed
+number of documents and reports files that hang or crash a worker as
+poisoned, so one bad upload cannot stall the whole batch.
+
+Items wait in one shared queue and each idle worker pulls the next one, so
+a worker stuck on a large document never holds back work others could do.
+Workers time each item themselves, so utilization reports per slot count
+only time spent on items, not time the results wait for the consumer.
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts still apply
+    resource = None
+
+_worker_parser = None
+
+
+def parse_resume_file(resume_path):
+    """Default pool task: parse one resume with a per-process ResumeParser"""
+    global _worker_parser
+    if _worker_parser is None:
+        from Parser.resume_parser import ResumeParser
+        _worker_parser = ResumeParser()
+    return _worker_parser.parse_resume(resume_path)
+
+
+def _address_space_bytes():
+    """Current virtual memory size of this process, or 0 if unknown"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _worker_main(conn, task, memory_limit_mb):
+    """Worker loop: receive (task_id, item), send back (status, task_id, payload, seconds)"""
+    if resource is not None and memory_limit_mb:
+        # Allow memory_limit_mb on top of what the process already maps
+        limit = _address_space_bytes() + memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        task_id, item = message
+        started = time.perf_counter()
+        try:
+            result = task(item)
+            conn.send(('ok', task_id, result, time.perf_counter() - started))
+        except MemoryError:
+            conn.send(('memory', task_id, "memory limit exceeded", time.perf_counter() - started))
+            return
+        except Exception as e:
+            conn.send(('error', task_id, f"{type(e).__name__}: {e}", time.perf_counter() - started))
+
+
+class _Worker:
+    def __init__(self, context, task, memory_limit_mb, slot=0):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, task, memory_limit_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        self.slot = slot
+        self.tasks_done = 0
+        self.current = None  # (task_id, item, deadline, started)
+
+    def assign(self, task_id, item, timeout):
+        self.conn.send((task_id, item))
+        started = time.monotonic()
+        self.current = (task_id, item, started + timeout, started)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SupervisedPool:
+    """
+    Process pool with per-document timeouts, memory caps and worker recycling
+    """
+
+    POISON_STATUSES = ('timeout', 'memory', 'crashed')
+
+    def __init__(self, task=parse_resume_file, workers=None, timeout=60,
+                 memory_limit_mb=1024, max_tasks_per_worker=200, start_method=None):
+        """
+        Args:
+            task: Picklable callable run on every item inside a worker
+            workers: Number of worker processes (defaults to CPU count)
+            timeout: Wall-clock seconds allowed per item
+            memory_limit_mb: Extra address space a worker may map (None disables)
+            max_tasks_per_worker: Recycle a worker after this many items
+            start_method: multiprocessing start method (platform default if None)
+        """
+        self.task = task
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.context = multiprocessing.get_context(start_method)
+
+        self.poisoned = []  # (item, status, message)
+        self.busy_seconds = {}  # worker slot -> seconds spent on items
+        self.tasks_by_slot = {}
+        self.wall_time = 0.0
+        self._pool = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spawn(self, slot):
+        return _Worker(self.context, self.task, self.memory_limit_mb, slot)
+
+    def _replace(self, worker, kill=False):
+        self._pool.remove(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        self._pool.append(self._spawn(worker.slot))
+
+    def utilization(self):
+        """
+        Per worker slot: tasks run, busy seconds and busy share of the wall time
+        spent inside map() (recycled workers count towards the slot they replaced)
+        """
+        wall = max(self.wall_time, 1e-9)
+        return [
+            {
+                'worker': slot,
+                'tasks': self.tasks_by_slot.get(slot, 0),
+                'busy_seconds': busy,
+                'utilization': min(busy / wall, 1.0),
+            }
+            for slot, busy in sorted(self.busy_seconds.items())
+        ]
+
+    def map(self, items):
+        """
+        Run the task over items, yielding (item, status, payload) as they finish
+        status is 'ok' (payload is the result), 'error' (the task raised) or
+        one of POISON_STATUSES; poisoned items are also kept in self.poisoned.
+        """
+        pending = deque(enumerate(items))
+        while len(self._pool) < min(self.workers, max(len(pending), 1)):
+            slot = len(self._pool)
+            self._pool.append(self._spawn(slot))
+            self.busy_seconds.setdefault(slot, 0.0)
+
+        map_started = time.monotonic()
+        wall_before = self.wall_time
+        respawned = set()  # workers started to replace one that died while idle
+
+        while True:
+            self.wall_time = wall_before + time.monotonic() - map_started
+            undeliverable = []
+            for worker in list(self._pool):
+                if worker.current is None and pending:
+                    if worker.tasks_done >= self.max_tasks_per_worker:
+                        self._replace(worker)
+                        continue
+                    task_id, item = pending.popleft()
+                    try:
+                        worker.assign(task_id, item, self.timeout)
+                    except OSError:
+                        # The worker died while idle: replace it and re-dispatch the item,
+                        # unless it was itself such a replacement (workers die on start-up)
+                        self._replace(worker, kill=True)
+                        respawned.add(self._pool[-1])
+                        if worker in respawned:
+                            payload = f"worker exited with code {worker.process.exitcode}"
+                            self.poisoned.append((item, 'crashed', payload))
+                            undeliverable.append((item, 'crashed', payload))
+                        else:
+                            pending.appendleft((task_id, item))
+
+            yield from undeliverable
+
+            busy = [worker for worker in self._pool if worker.current is not None]
+            if not busy:
+                if pending:
+                    continue
+                return
+
+            next_deadline = min(worker.current[2] for worker in busy)
+            ready = wait([worker.conn for worker in busy], timeout=max(next_deadline - time.monotonic(), 0))
+            now = time.monotonic()
+
+            # Settle every worker against one clock reading before yielding anything:
+            # time the consumer spends on a yield must not time out a finished worker
+            finished = []
+            for worker in busy:
+                _, item, deadline, started = worker.current
+
+                # Crashed and timed-out workers were busy until now; others report their own time
+                seconds = now - started
+                if worker.conn in ready or (now >= deadline and worker.conn.poll()):
+                    try:
+                        status, _, payload, seconds = worker.conn.recv()
+                    except (EOFError, OSError):
+                        status, payload = 'crashed', f"worker exited with code {worker.process.exitcode}"
+                elif now >= deadline:
+                    status, payload = 'timeout', f"no result after {self.timeout}s"
+                else:
+                    continue
+
+                worker.current = None
+                worker.tasks_done += 1
+                self.busy_seconds[worker.slot] += seconds
+                self.tasks_by_slot[worker.slot] = self.tasks_by_slot.get(worker.slot, 0) + 1
+
+                if status in self.POISON_STATUSES:
+                    self.poisoned.append((item, status, payload))
+                    self._replace(worker, kill=True)
+
+                finished.append((item, status, payload))
+
+            yield from finished
+
+    def close(self):
+        for worker in self._pool:
+            worker.stop()
+        self._pool = []
+
+
+# Test the pool on a hanging and a memory-hungry task
+def _demo_task(item):
+    if item == 'hang':
+        time.sleep(60)
+    if item == 'huge':
+        return len(bytearray(512 * 1024 * 1024))
+    return item.upper()
+
+
+if __name__ == "__main__":
+    with SupervisedPool(_demo_task, workers=2, timeout=2, memory_limit_mb=256,
+                        max_tasks_per_worker=2) as pool:
+        for item, status, payload in pool.map(['a', 'hang', 'b', 'huge', 'c', 'd']):
+            print(f"   {item}: {status} -> {payload}")
+
+        print(f"Poisoned: {[(item, status) for item, status, _ in pool.poisoned]}")
+        for worker in pool.utilization():
+            print(f"   worker {worker['worker']}: {worker['tasks']} items, {worker['utilization']:.0%} busy")